@@ -6,20 +6,421 @@ This module handles browser initialization, configuration, and management.
 
 import asyncio
 import os
-import glob
 import random
 import json
+import functools
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import ctypes
+import weakref
+import logging
 from pathlib import Path
-from playwright.async_api import async_playwright, Browser, BrowserContext, Page
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+from playwright.async_api import Browser, BrowserContext, Page
 from typing import Optional, Dict, Any, Tuple, List
 
+from .browser_pool import (get_playwright, acquire_playwright, release_playwright,
+                           get_context, DEFAULT_MAX_CONTEXTS_PER_BROWSER)
+from .context_pool import ContextPool
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Endpoint of a Chrome instance started manually with --remote-debugging-port=9222
+DEBUG_CDP_ENDPOINT = "http://localhost:9222"
+
+# Environment variable naming a shared browser's CDP endpoint
+CDP_ENDPOINT_ENV_VAR = "CDP_ENDPOINT"
+
+# File where the shared browser started by ensure_shared_browser() publishes its endpoint
+SHARED_ENDPOINT_FILE = os.path.expanduser("~/.cache/yujin-ai/cdp_endpoint")
+
+# On-disk cache of discovered Chrome profiles, keyed by user data directory
+PROFILES_CACHE_PATH = os.path.expanduser("~/.cache/yujin-ai/profiles.json")
+
+# Directory name prefix for numbered Chrome profiles (Profile 1, Profile 2, etc.)
+PROFILE_DIR_PREFIX = 'Profile '
+
+# Threads used to read profile Preferences files in parallel
+PROFILE_LOAD_WORKERS = 8
+
+# Modern desktop user agents to pick from when none is configured
+_MODERN_UAS: Tuple[str, ...] = (
+    # Chrome on Windows
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
+    # Chrome on macOS
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
+    # Firefox on Windows
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:123.0) Gecko/20100101 Firefox/123.0",
+    # Firefox on macOS
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:123.0) Gecko/20100101 Firefox/123.0",
+    # Safari on macOS
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.3 Safari/605.1.15",
+    # Edge on Windows
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36 Edg/122.0.0.0",
+)
+
+# Stealth overrides that mask automation and common fingerprinting signals
+_STEALTH_JS = """
+    // Override navigator properties to avoid detection
+    Object.defineProperty(navigator, 'webdriver', {
+        get: () => false,
+        configurable: true
+    });
+
+    // Override permissions
+    const originalQuery = window.navigator.permissions.query;
+    window.navigator.permissions.query = (parameters) => (
+        parameters.name === 'notifications' ?
+        Promise.resolve({ state: Notification.permission }) :
+        originalQuery(parameters)
+    );
+
+    // Prevent fingerprinting via canvas
+    const originalGetImageData = CanvasRenderingContext2D.prototype.getImageData;
+    CanvasRenderingContext2D.prototype.getImageData = function(x, y, w, h) {
+        const imageData = originalGetImageData.call(this, x, y, w, h);
+        // Add slight random noise to canvas data to prevent fingerprinting
+        for (let i = 0; i < imageData.data.length; i += 4) {
+            // Only modify a small percentage of pixels
+            if (Math.random() < 0.005) {
+                const offset = Math.floor(Math.random() * 2);
+                imageData.data[i] = Math.max(0, Math.min(255, imageData.data[i] + offset));
+                imageData.data[i+1] = Math.max(0, Math.min(255, imageData.data[i+1] + offset));
+                imageData.data[i+2] = Math.max(0, Math.min(255, imageData.data[i+2] + offset));
+            }
+        }
+        return imageData;
+    };
+
+    // Mask plugins and mime types
+    Object.defineProperty(navigator, 'plugins', {
+        get: () => {
+            const plugins = [
+                { name: 'Chrome PDF Plugin', filename: 'internal-pdf-viewer', description: 'Portable Document Format' },
+                { name: 'Chrome PDF Viewer', filename: 'mhjfbmdgcfjbbpaeojofohoefgiehjai', description: 'Portable Document Format' },
+                { name: 'Native Client', filename: 'internal-nacl-plugin', description: '' }
+            ];
+
+            plugins.__proto__ = window.PluginArray.prototype;
+            plugins.length = plugins.length;
+            plugins.item = function(index) { return this[index]; };
+            plugins.namedItem = function(name) {
+                for (const plugin of plugins) {
+                    if (plugin.name === name) return plugin;
+                }
+                return null;
+            };
+
+            return plugins;
+        }
+    });
+
+    // Mask platform
+    Object.defineProperty(navigator, 'platform', {
+        get: () => {
+            const platforms = ['MacIntel', 'Win32', 'Linux x86_64'];
+            return platforms[Math.floor(Math.random() * platforms.length)];
+        }
+    });
+
+    // Set hardware concurrency and device memory to common values
+    for (const property of ['hardwareConcurrency', 'deviceMemory']) {
+        try {
+            // Check if the property is configurable
+            const descriptor = Object.getOwnPropertyDescriptor(navigator, property);
+            if (descriptor && descriptor.configurable) {
+                Object.defineProperty(navigator, property, {
+                    get: () => {
+                        return [2, 4, 8][Math.floor(Math.random() * 3)];
+                    }
+                });
+            }
+        } catch (e) {
+            console.log(`Could not modify ${property}:`, e);
+        }
+    }
+"""
+
+# Adds slight randomness to mouse movement deltas
+_MOUSE_JS = """
+    // Store original mouse methods
+    const originalMouseMove = window.MouseEvent.prototype.movementX;
+    const originalMouseDown = window.MouseEvent.prototype.movementY;
+
+    // Add slight randomness to mouse movements
+    Object.defineProperties(MouseEvent.prototype, {
+        movementX: {
+            get: function() {
+                const value = typeof originalMouseMove === 'function' ? 
+                    originalMouseMove.call(this) : this.screenX - this.screenX;
+                return value + (Math.random() < 0.1 ? (Math.random() * 2 - 1) : 0);
+            }
+        },
+        movementY: {
+            get: function() {
+                const value = typeof originalMouseDown === 'function' ? 
+                    originalMouseDown.call(this) : this.screenY - this.screenY;
+                return value + (Math.random() < 0.1 ? (Math.random() * 2 - 1) : 0);
+            }
+        }
+    });
+"""
+
+
+def _minify_js(js: str) -> str:
+    """
+    Shrink an init script by dropping comment-only lines, blank lines and indentation.
+
+    Line breaks are kept so automatic semicolon insertion behaves as before.
+
+    Args:
+        js: JavaScript source
+
+    Returns:
+        Minified JavaScript source
+    """
+    lines = (line.strip() for line in js.splitlines())
+    return "\n".join(line for line in lines if line and not line.startswith("//"))
+
+
+def _build_init_script(enable_stealth_mode: bool, randomize_behavior: bool) -> str:
+    """
+    Combine the enabled scripts into one init script.
+
+    Each part runs in its own scope so their local names can't clash, and
+    returns early if it already ran in the document, so a context that ends
+    up with the script registered twice doesn't stack the overrides.
+
+    Args:
+        enable_stealth_mode: Whether to include the stealth overrides
+        randomize_behavior: Whether to include mouse randomization
+
+    Returns:
+        The combined, minified init script (empty if nothing is enabled)
+    """
+    scripts = []
+    if enable_stealth_mode:
+        scripts.append(("__stealthApplied", _STEALTH_JS))
+    if randomize_behavior:
+        scripts.append(("__mouseRandomized", _MOUSE_JS))
+    return "\n".join(
+        f"(() => {{\n"
+        f"if (window.{flag}) return;\n"
+        f"Object.defineProperty(window, '{flag}', {{ value: true, enumerable: false }});\n"
+        f"{_minify_js(script)}\n"
+        f"}})();"
+        for flag, script in scripts
+    )
+
+
+# Init scripts for every (stealth, randomize) combination, built once at import
+_INIT_SCRIPTS = {
+    (stealth, randomize): _build_init_script(stealth, randomize)
+    for stealth in (False, True)
+    for randomize in (False, True)
+}
+
+
+# Contexts that already have the stealth init script registered
+_STEALTHED_CONTEXTS: "weakref.WeakSet[BrowserContext]" = weakref.WeakSet()
+
+# In-process cache of discovered Chrome profiles, keyed by user data directory
+_PROFILES_MEMO: Dict[str, List[Dict[str, str]]] = {}
+
+
+# Common browser arguments to avoid detection
+_DEFAULT_ARGS = (
+    '--no-sandbox',
+    '--disable-blink-features=AutomationControlled',
+    '--disable-infobars',
+    '--disable-background-timer-throttling',
+    '--disable-popup-blocking',
+    '--disable-backgrounding-occluded-windows',
+    '--disable-renderer-backgrounding',
+    '--disable-window-activation',
+    '--disable-focus-on-load',
+    '--no-first-run',
+    '--no-default-browser-check',
+    '--no-startup-window',
+    '--window-position=0,0',
+)
+
+_WEBDRIVER_BYPASS_ARGS = (
+    '--disable-blink-features=AutomationControlled',
+    '--disable-features=AutomationControlled',
+)
+
+# Timezone, locale, geolocation (New York City) and permissions for a realistic fingerprint
+_FINGERPRINT_CONTEXT_OPTIONS = (
+    ("locale", "en-US"),
+    ("timezone_id", "America/New_York"),
+    ("geolocation", {"latitude": 40.7128, "longitude": -74.0060, "accuracy": 100}),
+    ("permissions", ["geolocation", "notifications"]),
+)
+
+# Additional options for regular (non-persistent) contexts
+_REGULAR_CONTEXT_OPTIONS = {
+    "ignore_https_errors": True,
+    "java_script_enabled": True,
+}
+
+
+@functools.lru_cache(maxsize=32)
+def _compute_launch_key(width: int,
+                        height: int,
+                        bypass_webdriver_flags: bool,
+                        user_agent: Optional[str]) -> Tuple[Tuple[str, ...], Tuple[Tuple[str, Any], ...]]:
+    """
+    Build the browser launch arguments and base context options for a configuration.
+
+    The result is hashable, so identical configurations share one instance and
+    produce equal browser pool keys.
+
+    Args:
+        width: Viewport width
+        height: Viewport height
+        bypass_webdriver_flags: Whether to add the webdriver detection bypass flags
+        user_agent: User agent string, if any
+
+    Returns:
+        Tuple of (launch arguments, context option items)
+    """
+    args = _DEFAULT_ARGS + (f'--window-size={width},{height}',)
+    if bypass_webdriver_flags:
+        args += _WEBDRIVER_BYPASS_ARGS
+
+    context_options = (("viewport", {"width": width, "height": height}),)
+    if user_agent:
+        context_options += (("user_agent", user_agent),)
+    context_options += _FINGERPRINT_CONTEXT_OPTIONS
+
+    return args, context_options
+
+
+# Chrome's single-instance lock files, which must not be carried into a snapshot
+_PROFILE_LOCK_FILES = ('SingletonLock', 'SingletonSocket', 'SingletonCookie', 'lockfile')
+
+
+def _cow_clone(src: str) -> Optional[str]:
+    """
+    Snapshot a Chrome user data directory into a private temp directory.
+
+    Only copy-on-write clones are used (reflinks on Linux, clonefile on
+    macOS), so the snapshot is near-instant. Filesystems without clone
+    support get no snapshot at all rather than a full copy of the profile.
+    Lock files are dropped so the snapshot can be launched while the
+    original profile is in use.
+
+    Args:
+        src: User data directory to snapshot
+
+    Returns:
+        Path to the snapshot directory, or None if the filesystem can't clone it
+    """
+    dst = tempfile.mkdtemp(prefix=f"yujin-{os.getpid()}-")
+    cloned = False
+
+    if sys.platform.startswith('linux'):
+        # --reflink=always fails instead of silently falling back to a full copy
+        result = subprocess.run(['cp', '--reflink=always', '-a', os.path.join(src, '.'), dst],
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        cloned = result.returncode == 0
+    elif sys.platform == 'darwin':
+        # clonefile() requires that the destination does not exist yet
+        os.rmdir(dst)
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            cloned = libc.clonefile(os.fsencode(src), os.fsencode(dst), 0) == 0
+        except (OSError, AttributeError):
+            cloned = False
+
+    if not cloned:
+        shutil.rmtree(dst, ignore_errors=True)
+        return None
+
+    for lock_file in _PROFILE_LOCK_FILES:
+        lock_path = os.path.join(dst, lock_file)
+        if os.path.lexists(lock_path):
+            os.remove(lock_path)
+
+    return dst
+
+
+def _json_loads(data: bytes) -> Any:
+    """Parse JSON bytes, using orjson when it is installed."""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _read_json_file(path: str) -> Any:
+    """Read and parse a JSON file."""
+    with open(path, 'rb') as f:
+        return _json_loads(f.read())
+
+
+def _write_json_file(path: str, data: Any) -> None:
+    """Serialize data to a JSON file, creating its directory if needed."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+
+
+def _read_profile_name(profile_dir: str) -> str:
+    """
+    Extract the user-friendly profile name from a profile's Preferences file.
+
+    Args:
+        profile_dir: Full path to the profile directory
+
+    Returns:
+        The profile name, or the directory name if it can't be read
+    """
+    try:
+        # A full parse (orjson when installed) is fast enough and, unlike a text
+        # search, can't pick up a "name" from some other object in the file
+        prefs = _read_json_file(os.path.join(profile_dir, 'Preferences'))
+        if 'profile' in prefs and 'name' in prefs['profile']:
+            return prefs['profile']['name']
+    except Exception:
+        pass
+    # Return the directory name if we can't find the profile name
+    return os.path.basename(profile_dir)
+
 
 class BrowserManager:
     """Manages browser instances for automation tasks."""
     
+    __slots__ = (
+        'headless', 'slow_mo', 'viewport_size', 'user_agent', 'user_data_dir',
+        'proxy', 'enable_stealth_mode', 'randomize_behavior', 'bypass_webdriver_flags',
+        'use_debug_mode', 'max_contexts_per_browser', 'cdp_endpoint', 'storage_state_path',
+        'context_pool', 'logger',
+        'playwright', 'browser', 'context', 'page',
+        'snapshot_user_data', '_owns_browser', '_user_data_snapshot',
+    )
+    
+    # CDP endpoint of the shared browser, set by ensure_shared_browser()
+    _shared_cdp_endpoint: Optional[str] = None
+    
     def __init__(self, 
                  headless: bool = False, 
-                 slow_mo: int = 50,
+                 slow_mo: int = 0,
                  viewport_size: Dict[str, int] = {"width": 1280, "height": 800},
                  user_agent: Optional[str] = None,
                  user_data_dir: Optional[str] = None,
@@ -27,13 +428,18 @@ class BrowserManager:
                  enable_stealth_mode: bool = True,
                  randomize_behavior: bool = True,
                  bypass_webdriver_flags: bool = True,
-                 use_debug_mode: bool = True):
+                 use_debug_mode: bool = True,
+                 max_contexts_per_browser: int = DEFAULT_MAX_CONTEXTS_PER_BROWSER,
+                 cdp_endpoint: Optional[str] = None,
+                 storage_state_path: Optional[str] = None,
+                 context_pool: Optional[ContextPool] = None,
+                 snapshot_user_data: bool = False):
         """
         Initialize the browser manager.
         
         Args:
             headless: Whether to run browser in headless mode
-            slow_mo: Slow down operations by specified milliseconds
+            slow_mo: Slow down operations by specified milliseconds (only honored in debug mode)
             viewport_size: Browser viewport dimensions
             user_agent: Custom user agent string
             user_data_dir: Path to Chrome user data directory for using existing profiles
@@ -41,6 +447,15 @@ class BrowserManager:
             enable_stealth_mode: Whether to enable stealth mode to avoid detection
             randomize_behavior: Whether to randomize behavior to appear more human-like
             bypass_webdriver_flags: Whether to bypass webdriver detection flags
+            use_debug_mode: Whether to attach to a Chrome instance on localhost:9222
+            max_contexts_per_browser: Contexts a pooled browser serves before being relaunched
+            cdp_endpoint: CDP endpoint (http:// or ws://) of a long-lived browser to reuse
+            storage_state_path: Storage state file (cookies, localStorage) to seed new contexts with
+            context_pool: Pool of pre-warmed contexts to take the context from instead of creating one
+            snapshot_user_data: Launch a persistent context from a copy-on-write snapshot of
+                                user_data_dir so the real profile isn't locked. Only used where
+                                the filesystem can clone; the session is saved to
+                                storage_state_path before the snapshot is removed
         """
         self.headless = headless
         self.slow_mo = slow_mo
@@ -52,11 +467,19 @@ class BrowserManager:
         self.randomize_behavior = randomize_behavior
         self.bypass_webdriver_flags = bypass_webdriver_flags
         self.use_debug_mode = use_debug_mode
+        self.max_contexts_per_browser = max_contexts_per_browser
+        self.cdp_endpoint = cdp_endpoint or (DEBUG_CDP_ENDPOINT if use_debug_mode else None)
+        self.storage_state_path = storage_state_path
+        self.context_pool = context_pool
+        self.snapshot_user_data = snapshot_user_data
+        self.logger = logging.getLogger("BrowserManager")
         
         self.playwright = None
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
+        self._owns_browser = True
+        self._user_data_snapshot: Optional[str] = None
     
     def _get_random_user_agent(self) -> str:
         """
@@ -65,32 +488,16 @@ class BrowserManager:
         Returns:
             A random user agent string
         """
-        modern_user_agents = [
-            # Chrome on Windows
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
-            # Chrome on macOS
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
-            # Firefox on Windows
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:123.0) Gecko/20100101 Firefox/123.0",
-            # Firefox on macOS
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:123.0) Gecko/20100101 Firefox/123.0",
-            # Safari on macOS
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.3 Safari/605.1.15",
-            # Edge on Windows
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36 Edg/122.0.0.0",
-        ]
-        return random.choice(modern_user_agents)
+        return random.choice(_MODERN_UAS)
     
     @staticmethod
-    def get_chrome_profiles() -> List[Dict[str, str]]:
+    def _get_chrome_base_path() -> Optional[str]:
         """
-        Get list of available Chrome profiles on the system.
-        
+        Get the Chrome user data directory for the current OS.
+
         Returns:
-            List of dictionaries with profile name and path
+            Path to the user data directory, or None if unsupported or missing
         """
-        profiles = []
-        
         # Default Chrome profile locations based on OS
         if os.name == 'posix':  # macOS or Linux
             if os.path.exists('/Applications/Google Chrome.app'):
@@ -102,194 +509,324 @@ class BrowserManager:
         elif os.name == 'nt':  # Windows
             base_path = os.path.join(os.environ['LOCALAPPDATA'], 'Google', 'Chrome', 'User Data')
         else:
-            return profiles  # Unsupported OS
-            
+            return None  # Unsupported OS
+
         if not os.path.exists(base_path):
-            return profiles
-        
-        def get_profile_name(profile_dir):
-            """Extract the user-friendly profile name from the Preferences file"""
-            try:
-                prefs_file = os.path.join(profile_dir, 'Preferences')
-                if os.path.exists(prefs_file):
-                    with open(prefs_file, 'r', encoding='utf-8') as f:
-                        import json
-                        prefs = json.load(f)
-                        if 'profile' in prefs and 'name' in prefs['profile']:
-                            return prefs['profile']['name']
-            except Exception:
-                pass
-            # Return the directory name if we can't find the profile name
-            return os.path.basename(profile_dir)
-            
-        # Get all profile directories
-        default_profile = os.path.join(base_path, 'Default')
-        if os.path.exists(default_profile):
-            display_name = get_profile_name(default_profile)
-            profiles.append({
-                'name': 'Default',
-                'display_name': display_name,
-                'path': base_path,
-                'profile': 'Default'
-            })
-            
-        # Look for numbered profiles (Profile 1, Profile 2, etc.)
-        for profile_dir in glob.glob(os.path.join(base_path, 'Profile *')):
-            profile_name = os.path.basename(profile_dir)
-            display_name = get_profile_name(profile_dir)
-            profiles.append({
-                'name': profile_name,
-                'display_name': display_name,
-                'path': base_path,
-                'profile': profile_name
-            })
-            
-        return profiles
-    
-    async def _apply_stealth_mode(self, page: Page):
+            return None
+        return base_path
+
+    @staticmethod
+    def _get_profiles_signature(profile_dirs: List[Tuple[str, str]]) -> str:
         """
-        Apply stealth mode to avoid detection.
-        
+        Build a cheap validator for the profile list from Preferences mtimes.
+
         Args:
-            page: Playwright page object
-        """
-        # Inject stealth scripts to mask automation
-        await page.add_init_script("""
-        () => {
-            // Override navigator properties to avoid detection
-            Object.defineProperty(navigator, 'webdriver', {
-                get: () => false,
-                configurable: true
-            });
-            
-            // Override permissions
-            const originalQuery = window.navigator.permissions.query;
-            window.navigator.permissions.query = (parameters) => (
-                parameters.name === 'notifications' ?
-                Promise.resolve({ state: Notification.permission }) :
-                originalQuery(parameters)
-            );
-            
-            // Prevent fingerprinting via canvas
-            const originalGetImageData = CanvasRenderingContext2D.prototype.getImageData;
-            CanvasRenderingContext2D.prototype.getImageData = function(x, y, w, h) {
-                const imageData = originalGetImageData.call(this, x, y, w, h);
-                // Add slight random noise to canvas data to prevent fingerprinting
-                for (let i = 0; i < imageData.data.length; i += 4) {
-                    // Only modify a small percentage of pixels
-                    if (Math.random() < 0.005) {
-                        const offset = Math.floor(Math.random() * 2);
-                        imageData.data[i] = Math.max(0, Math.min(255, imageData.data[i] + offset));
-                        imageData.data[i+1] = Math.max(0, Math.min(255, imageData.data[i+1] + offset));
-                        imageData.data[i+2] = Math.max(0, Math.min(255, imageData.data[i+2] + offset));
-                    }
-                }
-                return imageData;
-            };
-            
-            // Mask plugins and mime types
-            Object.defineProperty(navigator, 'plugins', {
-                get: () => {
-                    const plugins = [
-                        { name: 'Chrome PDF Plugin', filename: 'internal-pdf-viewer', description: 'Portable Document Format' },
-                        { name: 'Chrome PDF Viewer', filename: 'mhjfbmdgcfjbbpaeojofohoefgiehjai', description: 'Portable Document Format' },
-                        { name: 'Native Client', filename: 'internal-nacl-plugin', description: '' }
-                    ];
-                    
-                    plugins.__proto__ = window.PluginArray.prototype;
-                    plugins.length = plugins.length;
-                    plugins.item = function(index) { return this[index]; };
-                    plugins.namedItem = function(name) {
-                        for (const plugin of plugins) {
-                            if (plugin.name === name) return plugin;
-                        }
-                        return null;
-                    };
-                    
-                    return plugins;
-                }
-            });
-            
-            // Mask platform
-            Object.defineProperty(navigator, 'platform', {
-                get: () => {
-                    const platforms = ['MacIntel', 'Win32', 'Linux x86_64'];
-                    return platforms[Math.floor(Math.random() * platforms.length)];
-                }
-            });
-        }
-        """)
+            profile_dirs: (profile name, profile directory) tuples from _list_profile_dirs()
+
+        Returns:
+            Signature that changes when a profile is added, removed or renamed
+        """
+        mtimes = []
+        for _, profile_dir in profile_dirs:
+            try:
+                mtimes.append(os.stat(os.path.join(profile_dir, 'Preferences')).st_mtime_ns)
+            except OSError:
+                mtimes.append(0)
+        return f"{len(mtimes)}:{max(mtimes, default=0)}"
+
+    @staticmethod
+    def _read_profiles_cache() -> Dict[str, Any]:
+        """Load the on-disk profiles cache, or an empty dict if unusable."""
+        try:
+            with open(PROFILES_CACHE_PATH, 'rb') as f:
+                cache = _json_loads(f.read())
+            return cache if isinstance(cache, dict) else {}
+        except Exception:
+            return {}
+
+    @staticmethod
+    def _write_profiles_cache(cache: Dict[str, Any]) -> None:
+        """Atomically write the on-disk profiles cache, ignoring failures."""
+        try:
+            os.makedirs(os.path.dirname(PROFILES_CACHE_PATH), exist_ok=True)
+            tmp_path = f"{PROFILES_CACHE_PATH}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(cache, f)
+            os.replace(tmp_path, PROFILES_CACHE_PATH)
+        except OSError:
+            pass
+
+    @staticmethod
+    def get_chrome_profiles() -> List[Dict[str, str]]:
+        """
+        Get list of available Chrome profiles on the system.
+
+        Results are cached in memory for the life of the process and on disk
+        across runs, revalidated against the Preferences file mtimes.
         
-        # Set hardware concurrency to a common value
-        await page.evaluate("""
-        () => {
-            try {
-                // Check if the property is configurable
-                const descriptor = Object.getOwnPropertyDescriptor(navigator, 'hardwareConcurrency');
-                if (descriptor && descriptor.configurable) {
-                    Object.defineProperty(navigator, 'hardwareConcurrency', {
-                        get: () => {
-                            return [2, 4, 8][Math.floor(Math.random() * 3)];
-                        }
-                    });
-                }
-            } catch (e) {
-                console.log('Could not modify hardwareConcurrency:', e);
-            }
-        }
-        """)
+        Returns:
+            List of dictionaries with profile name and path
+        """
+        base_path = BrowserManager._get_chrome_base_path()
+        if not base_path:
+            return []
+
+        if base_path not in _PROFILES_MEMO:
+            profile_dirs, signature, cache, profiles = BrowserManager._lookup_profiles_cache(base_path)
+            if profiles is None:
+                # Overlap the Preferences reads; map() keeps the directory order
+                with ThreadPoolExecutor(max_workers=PROFILE_LOAD_WORKERS) as executor:
+                    profiles = list(executor.map(
+                        lambda entry: BrowserManager._load_profile(base_path, *entry),
+                        profile_dirs
+                    ))
+                BrowserManager._store_profiles_cache(cache, base_path, signature, profiles)
+            _PROFILES_MEMO[base_path] = profiles
+
+        return [dict(profile) for profile in _PROFILES_MEMO[base_path]]
+
+    @staticmethod
+    async def get_chrome_profiles_async() -> List[Dict[str, str]]:
+        """
+        Async variant of get_chrome_profiles() that reads Preferences files concurrently.
         
-        # Randomize device memory
-        await page.evaluate("""
-        () => {
-            try {
-                // Check if the property is configurable
-                const descriptor = Object.getOwnPropertyDescriptor(navigator, 'deviceMemory');
-                if (descriptor && descriptor.configurable) {
-                    Object.defineProperty(navigator, 'deviceMemory', {
-                        get: () => {
-                            return [2, 4, 8][Math.floor(Math.random() * 3)];
-                        }
-                    });
-                }
-            } catch (e) {
-                console.log('Could not modify deviceMemory:', e);
-            }
+        Returns:
+            List of dictionaries with profile name and path
+        """
+        base_path = BrowserManager._get_chrome_base_path()
+        if not base_path:
+            return []
+
+        if base_path not in _PROFILES_MEMO:
+            profile_dirs, signature, cache, profiles = BrowserManager._lookup_profiles_cache(base_path)
+            if profiles is None:
+                profiles = list(await asyncio.gather(*[
+                    asyncio.to_thread(BrowserManager._load_profile, base_path, profile_name, profile_dir)
+                    for profile_name, profile_dir in profile_dirs
+                ]))
+                BrowserManager._store_profiles_cache(cache, base_path, signature, profiles)
+            _PROFILES_MEMO[base_path] = profiles
+
+        return [dict(profile) for profile in _PROFILES_MEMO[base_path]]
+
+    @staticmethod
+    def _lookup_profiles_cache(base_path: str) -> Tuple[List[Tuple[str, str]], str, Dict[str, Any], Optional[List[Dict[str, str]]]]:
+        """
+        Look up profiles for a user data directory in the on-disk cache.
+
+        The directory listing used to build the signature is returned too, so
+        a cache miss can scan the same directories without listing them again.
+
+        Args:
+            base_path: Chrome user data directory
+
+        Returns:
+            Tuple of (profile directories, current signature, loaded cache,
+            cached profiles or None if stale)
+        """
+        profile_dirs = BrowserManager._list_profile_dirs(base_path)
+        signature = BrowserManager._get_profiles_signature(profile_dirs)
+        cache = BrowserManager._read_profiles_cache()
+        entry = cache.get(base_path)
+        if isinstance(entry, dict) and entry.get('sig') == signature:
+            return profile_dirs, signature, cache, entry['profiles']
+        return profile_dirs, signature, cache, None
+
+    @staticmethod
+    def _store_profiles_cache(cache: Dict[str, Any], base_path: str, signature: str, profiles: List[Dict[str, str]]) -> None:
+        """Record freshly scanned profiles in the loaded cache and write it to disk."""
+        cache[base_path] = {'sig': signature, 'profiles': profiles}
+        BrowserManager._write_profiles_cache(cache)
+
+    @staticmethod
+    def _list_profile_dirs(base_path: str) -> List[Tuple[str, str]]:
+        """
+        List the profile directories in the Chrome user data directory.
+
+        Args:
+            base_path: Chrome user data directory
+
+        Returns:
+            List of (profile name, profile directory) tuples
+        """
+        default_dirs = []
+        numbered_dirs = []
+
+        # One directory pass; DirEntry gives name and type without extra stat calls
+        try:
+            with os.scandir(base_path) as entries:
+                for entry in entries:
+                    if not entry.is_dir(follow_symlinks=False):
+                        continue
+                    if entry.name == 'Default':
+                        default_dirs.append(('Default', entry.path))
+                    elif entry.name.startswith(PROFILE_DIR_PREFIX):
+                        # Numbered profiles (Profile 1, Profile 2, etc.)
+                        numbered_dirs.append((entry.name, entry.path))
+        except OSError:
+            return []
+
+        profile_dirs = default_dirs + numbered_dirs
+        return profile_dirs
+
+    @staticmethod
+    def _load_profile(base_path: str, profile_name: str, profile_dir: str) -> Dict[str, str]:
+        """
+        Build the profile entry for a single profile directory.
+
+        Args:
+            base_path: Chrome user data directory
+            profile_name: Profile directory name (e.g. 'Default', 'Profile 1')
+            profile_dir: Full path to the profile directory
+
+        Returns:
+            Dictionary with profile name and path
+        """
+        return {
+            'name': profile_name,
+            'display_name': _read_profile_name(profile_dir),
+            'path': base_path,
+            'profile': profile_name
         }
-        """)
     
-    async def _randomize_mouse_movements(self, page: Page):
+    @staticmethod
+    def _is_endpoint_reachable(endpoint: str, timeout: float = 0.5) -> bool:
         """
-        Add a script to randomize mouse movements to appear more human-like.
-        
+        Check whether something is listening on a CDP endpoint.
+
         Args:
-            page: Playwright page object
+            endpoint: CDP endpoint URL (http:// or ws://)
+            timeout: Connection timeout in seconds
+
+        Returns:
+            True if a TCP connection to the endpoint succeeds, False otherwise
         """
-        await page.add_init_script("""
-        () => {
-            // Store original mouse methods
-            const originalMouseMove = window.MouseEvent.prototype.movementX;
-            const originalMouseDown = window.MouseEvent.prototype.movementY;
-            
-            // Add slight randomness to mouse movements
-            Object.defineProperties(MouseEvent.prototype, {
-                movementX: {
-                    get: function() {
-                        const value = typeof originalMouseMove === 'function' ? 
-                            originalMouseMove.call(this) : this.screenX - this.screenX;
-                        return value + (Math.random() < 0.1 ? (Math.random() * 2 - 1) : 0);
-                    }
-                },
-                movementY: {
-                    get: function() {
-                        const value = typeof originalMouseDown === 'function' ? 
-                            originalMouseDown.call(this) : this.screenY - this.screenY;
-                        return value + (Math.random() < 0.1 ? (Math.random() * 2 - 1) : 0);
-                    }
-                }
-            });
-        }
-        """)
+        parsed = urlparse(endpoint)
+        if not parsed.hostname or not parsed.port:
+            return False
+        try:
+            with socket.create_connection((parsed.hostname, parsed.port), timeout=timeout):
+                return True
+        except OSError:
+            return False
+
+    @staticmethod
+    async def spawn_shared(endpoint_file: str,
+                           user_data_dir: Optional[str] = None,
+                           headless: bool = False,
+                           timeout: float = 10.0) -> str:
+        """
+        Get the endpoint of a shared, long-lived Chromium, spawning it if needed.
+
+        The first process launches Chromium with --remote-debugging-port=0, reads
+        the chosen port from DevToolsActivePort and writes the ws:// endpoint to
+        endpoint_file. Later processes find a live endpoint there and reuse it.
+        Access to endpoint_file is serialized with an flock where available.
+
+        Args:
+            endpoint_file: File used to publish the browser's CDP endpoint
+            user_data_dir: Profile directory for the shared browser (temp dir if None)
+            headless: Whether to run the shared browser headless
+            timeout: Seconds to wait for the browser to report its endpoint
+
+        Returns:
+            The ws:// CDP endpoint of the shared browser
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(endpoint_file)), exist_ok=True)
+
+        with open(endpoint_file + ".lock", "w") as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+            # Reuse the published endpoint if its browser is still running
+            if os.path.exists(endpoint_file):
+                with open(endpoint_file, "r") as f:
+                    endpoint = f.read().strip()
+                if endpoint and BrowserManager._is_endpoint_reachable(endpoint):
+                    return endpoint
+
+            playwright = await get_playwright()
+            user_data_dir = user_data_dir or tempfile.mkdtemp(prefix="yujin-chrome-")
+            port_file = os.path.join(user_data_dir, "DevToolsActivePort")
+            if os.path.exists(port_file):
+                os.remove(port_file)
+
+            args = [
+                playwright.chromium.executable_path,
+                "--remote-debugging-port=0",
+                f"--user-data-dir={user_data_dir}",
+                "--no-first-run",
+                "--no-default-browser-check",
+            ]
+            if headless:
+                args.append("--headless=new")
+
+            # Detach so the browser outlives this process
+            subprocess.Popen(args,
+                             stdout=subprocess.DEVNULL,
+                             stderr=subprocess.DEVNULL,
+                             start_new_session=True)
+
+            # DevToolsActivePort holds the port on line one and the browser path on line two
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + timeout
+            while True:
+                if os.path.exists(port_file):
+                    with open(port_file, "r") as f:
+                        lines = f.read().split("\n")
+                    if len(lines) >= 2 and lines[0].strip() and lines[1].strip():
+                        break
+                if loop.time() > deadline:
+                    raise RuntimeError(f"Shared browser did not report a CDP endpoint within {timeout}s")
+                await asyncio.sleep(0.05)
+
+            endpoint = f"ws://127.0.0.1:{lines[0].strip()}{lines[1].strip()}"
+            with open(endpoint_file, "w") as f:
+                f.write(endpoint)
+
+            return endpoint
+
+    @classmethod
+    async def ensure_shared_browser(cls, endpoint_file: str = SHARED_ENDPOINT_FILE, headless: bool = False) -> str:
+        """
+        Make sure a shared browser is running and use it for every new manager.
+
+        Managers without an explicit cdp_endpoint connect to this browser and
+        get their own fresh context instead of launching Chromium.
+
+        Args:
+            endpoint_file: File used to publish the shared browser's CDP endpoint
+            headless: Whether to run the shared browser headless
+
+        Returns:
+            The ws:// CDP endpoint of the shared browser
+        """
+        cls._shared_cdp_endpoint = await cls.spawn_shared(endpoint_file, headless=headless)
+        return cls._shared_cdp_endpoint
+
+    def _init_script_flags(self) -> Tuple[bool, bool]:
+        """Flags selecting the init script registered on this manager's contexts."""
+        return (self.enable_stealth_mode, self.randomize_behavior)
+
+    async def _apply_stealth_mode_to_context(self, context: BrowserContext):
+        """
+        Register the stealth and mouse-randomization scripts on a context.
+
+        All enabled scripts are merged into one init script and registered once
+        per context, so every page in the context inherits them with no
+        per-page CDP calls.
+
+        Args:
+            context: Playwright browser context
+        """
+        if context in _STEALTHED_CONTEXTS:
+            return
+
+        combined_js = _INIT_SCRIPTS[self._init_script_flags()]
+        if combined_js:
+            await context.add_init_script(combined_js)
+
+        _STEALTHED_CONTEXTS.add(context)
     
     async def start(self) -> Page:
         """
@@ -298,68 +835,68 @@ class BrowserManager:
         Returns:
             The main browser page
         """
-        # Launch playwright
-        self.playwright = await async_playwright().start()
-        
-        # Common browser arguments to avoid detection
-        browser_args = [
-            '--no-sandbox',
-            '--disable-blink-features=AutomationControlled',
-            '--disable-infobars',
-            '--disable-background-timer-throttling',
-            '--disable-popup-blocking',
-            '--disable-backgrounding-occluded-windows',
-            '--disable-renderer-backgrounding',
-            '--disable-window-activation',
-            '--disable-focus-on-load',
-            '--no-first-run',
-            '--no-default-browser-check',
-            '--no-startup-window',
-            '--window-position=0,0',
-            f'--window-size={self.viewport_size["width"]},{self.viewport_size["height"]}',
-        ]
+        # Hold a reference to the shared playwright driver until close(). A context
+        # pool's browser belongs to whoever created the pool, so it takes none
+        if self.playwright is None and not self.context_pool:
+            self.playwright = await acquire_playwright()
         
-        if self.bypass_webdriver_flags:
-            browser_args.extend([
-                '--disable-blink-features=AutomationControlled',
-                '--disable-features=AutomationControlled',
-            ])
+        # Launch arguments and context options are built once per configuration
+        launch_args, base_context_options = _compute_launch_key(
+            self.viewport_size["width"],
+            self.viewport_size["height"],
+            self.bypass_webdriver_flags,
+            self.user_agent
+        )
+        browser_args = list(launch_args)
+        context_options = dict(base_context_options)
         
-        # Context options
-        context_options = {
-            "viewport": self.viewport_size,
-        }
+        # slow_mo delays every action; it is a debugging aid, not something to ship
+        slow_mo = self.slow_mo if self.use_debug_mode else 0
         
-        # Additional options for regular (non-persistent) context
-        regular_context_options = {
-            "ignoreHTTPSErrors": True,
-            "javaScriptEnabled": True,
-        }
+        # Add random viewport noise to avoid fingerprinting. It is baked into the
+        # context options so no extra set_viewport_size round-trip is needed
+        if self.randomize_behavior:
+            # Slightly randomize the viewport size (±5 pixels)
+            context_options["viewport"] = {
+                "width": self.viewport_size["width"] + random.randint(-5, 5),
+                "height": self.viewport_size["height"] + random.randint(-5, 5)
+            }
         
-        if self.user_agent:
-            context_options["userAgent"] = self.user_agent
-            
         if self.proxy:
             context_options["proxy"] = self.proxy
-            
-        # Add timezone and locale for more realistic browser fingerprint
-        context_options["locale"] = "en-US"
-        context_options["timezoneId"] = "America/New_York"
         
-        # Add geolocation for more realistic browser fingerprint
-        context_options["geolocation"] = {
-            "latitude": 40.7128,  # New York City coordinates
-            "longitude": -74.0060,
-            "accuracy": 100
-        }
+        # Restore a saved session so we don't have to log in again
+        if self.storage_state_path and os.path.exists(self.storage_state_path):
+            context_options["storage_state"] = self.storage_state_path
         
-        # Add permissions
-        context_options["permissions"] = ["geolocation", "notifications"]
+        # An explicit endpoint (or debug mode) attaches to the user's own browser and
+        # reuses its logged-in default context; a shared endpoint gets a fresh context
+        cdp_endpoint = self.cdp_endpoint
+        reuse_default_context = bool(cdp_endpoint)
+        if not cdp_endpoint:
+            cdp_endpoint = os.environ.get(CDP_ENDPOINT_ENV_VAR) or BrowserManager._shared_cdp_endpoint
         
-        if self.use_debug_mode:
-            self.browser = await self.playwright.chromium.connect_over_cdp("http://localhost:9222")
-            self.context = self.browser.contexts[0]
-            self.page = self.context.pages[0]
+        if cdp_endpoint and not self.context_pool:
+            # Attach to a long-lived browser; fall back to launching if it is unreachable
+            try:
+                self.browser = await self.playwright.chromium.connect_over_cdp(cdp_endpoint, slow_mo=slow_mo)
+            except Exception as e:
+                self.logger.warning(f"Could not connect to CDP endpoint {cdp_endpoint}: {str(e)}")
+                self.browser = None
+
+        if self.context_pool:
+            # Take a pre-warmed context from the pool
+            self._owns_browser = False
+            self.browser = self.context_pool.browser
+            self.context = await self.context_pool.acquire(self._init_script_flags())
+            self.page = await self.context.new_page()
+        elif self.browser:
+            if reuse_default_context and self.browser.contexts:
+                self.context = self.browser.contexts[0]
+            else:
+                self.context = await self.browser.new_context(**context_options, **_REGULAR_CONTEXT_OPTIONS)
+            pages = self.context.pages
+            self.page = pages[0] if pages else await self.context.new_page()
         elif self.user_data_dir and os.path.exists(self.user_data_dir):
             # If user data directory is specified, use persistent context
             # When using a persistent context, we don't need to create a browser instance
@@ -377,89 +914,130 @@ class BrowserManager:
             if self.user_agent:
                 browser_args.append(f'--user-agent="{self.user_agent}"')
             
-            self.context = await self.playwright.chromium.launch_persistent_context(
-                user_data_dir=self.user_data_dir,
-                executable_path=executable_path if os.path.exists(executable_path) else None,
-                headless=self.headless,
-                slow_mo=self.slow_mo,
-                args=browser_args,
-                **persistent_context_options
-            )
+            # Optionally launch from a copy-on-write snapshot so the real profile isn't locked
+            if self.snapshot_user_data:
+                self._user_data_snapshot = await asyncio.to_thread(_cow_clone, self.user_data_dir)
+                if not self._user_data_snapshot:
+                    self.logger.info("Filesystem can't clone the profile; launching from it directly")
+            
+            try:
+                self.context = await self.playwright.chromium.launch_persistent_context(
+                    user_data_dir=self._user_data_snapshot or self.user_data_dir,
+                    executable_path=executable_path if os.path.exists(executable_path) else None,
+                    headless=self.headless,
+                    slow_mo=slow_mo,
+                    args=browser_args,
+                    **persistent_context_options
+                )
+            except Exception:
+                self._remove_user_data_snapshot()
+                raise
+            
+            # The snapshot only has the profile as it was on disk; bring back the
+            # session saved when the last snapshot was closed
+            if self._user_data_snapshot and self.storage_state_path and os.path.exists(self.storage_state_path):
+                await self.load_storage_state(self.storage_state_path)
             
             # Get the first page or create a new one
             pages = self.context.pages
             self.page = pages[0] if pages else await self.context.new_page()
         else:
-            # Launch a regular browser and context
-            self.browser = await self.playwright.chromium.launch(
-                headless=self.headless,
-                slow_mo=self.slow_mo,
-                args=browser_args
+            # Reuse a pooled browser and only create a fresh context for this manager
+            self._owns_browser = False
+            self.context = await get_context(
+                {
+                    "headless": self.headless,
+                    "slow_mo": slow_mo,
+                    "args": browser_args,
+                },
+                {**context_options, **_REGULAR_CONTEXT_OPTIONS},
+                max_contexts_per_browser=self.max_contexts_per_browser,
+                setup_key=self._init_script_flags()
             )
-            
-            # Create a browser context with all options
-            all_context_options = {**context_options, **regular_context_options}
-            self.context = await self.browser.new_context(**all_context_options)
+            self.browser = self.context.browser
             self.page = await self.context.new_page()
         
-        # Apply stealth mode if enabled
-        if self.enable_stealth_mode:
-            await self._apply_stealth_mode(self.page)
-            
-        # Add randomized mouse movements if enabled
-        if self.randomize_behavior:
-            await self._randomize_mouse_movements(self.page)
-            
-        # Add random viewport noise to avoid fingerprinting
-        if self.randomize_behavior:
-            # Slightly randomize the viewport size (±5 pixels)
-            width_noise = random.randint(-5, 5)
-            height_noise = random.randint(-5, 5)
-            await self.page.set_viewport_size({
-                "width": self.viewport_size["width"] + width_noise,
-                "height": self.viewport_size["height"] + height_noise
-            })
+        # Register stealth mode and randomized mouse movements on the context
+        await self._apply_stealth_mode_to_context(self.context)
         
         return self.page
     
-    async def close(self):
-        """Close the browser and all associated resources."""
-        if self.context and not self.browser:
-            # If we have a context but no browser, we're using a persistent context
+    async def close(self, wait_time: float = 0.0):
+        """
+        Close the browser and all associated resources.
+
+        Pooled browsers and the shared playwright driver stay alive while other
+        managers on the same event loop use them, and are shut down when the
+        last one closes.
+
+        Args:
+            wait_time: Seconds to let in-flight requests drain before closing
+                       (0 closes immediately)
+        """
+        if wait_time > 0 and self.page and not self.page.is_closed():
+            # Wait for the network to go idle, but never longer than wait_time
+            try:
+                await asyncio.wait_for(self.page.wait_for_load_state("networkidle"), timeout=wait_time)
+            except Exception:
+                pass
+
+        if self.context_pool and self.context:
+            # Pooled context: reset it and hand it back instead of closing
+            await self.context_pool.release(self.context)
+        elif self.context and not self.browser:
+            # If we have a context but no browser, we're using a persistent context.
+            # A snapshot is deleted below, so keep the session it collected first
+            if self._user_data_snapshot and self.storage_state_path:
+                await self.save_storage_state(self.storage_state_path)
             await self.context.close()
+        elif self.browser and not self._owns_browser:
+            # Pooled browser: only close our own context
+            if self.context:
+                await self.context.close()
         elif self.browser:
             await self.browser.close()
-            
-        if self.playwright:
-            await self.playwright.stop()
+
+        # Remove the profile snapshot used by a persistent context
+        self._remove_user_data_snapshot()
+
+        # The last manager to close shuts down the pooled browsers and the driver
+        if self.playwright is not None:
+            self.playwright = None
+            await release_playwright()
+
+    def _remove_user_data_snapshot(self) -> None:
+        """Delete the profile snapshot, if one was made."""
+        if self._user_data_snapshot:
+            shutil.rmtree(self._user_data_snapshot, ignore_errors=True)
+            self._user_data_snapshot = None
             
     async def new_page(self) -> Page:
         """Create and return a new page in the current context."""
         if not self.context:
             raise RuntimeError("Browser context not initialized. Call start() first.")
         
-        page = await self.context.new_page()
-        
-        # Apply stealth mode to new page if enabled
-        if self.enable_stealth_mode:
-            await self._apply_stealth_mode(page)
-            
-        # Add randomized mouse movements if enabled
-        if self.randomize_behavior:
-            await self._randomize_mouse_movements(page)
-        
-        return page
+        # Stealth scripts are registered on the context, so the page inherits them
+        return await self.context.new_page()
     
     async def save_storage_state(self, path: str):
         """Save browser storage state (cookies, localStorage) to a file."""
         if self.context:
-            await self.context.storage_state(path=path)
+            storage_state = await self.context.storage_state()
+            # Serialize and write off the event loop
+            await asyncio.to_thread(_write_json_file, path, storage_state)
             
     async def load_storage_state(self, path: str):
-        """Load browser storage state (cookies, localStorage) from a file."""
+        """
+        Load cookies from a storage state file into the already running context.
+
+        Prefer passing storage_state_path to the constructor, which restores
+        cookies and localStorage when the context is created.
+        """
         if os.path.exists(path):
             if self.context:
-                await self.context.add_cookies(json.load(open(path))["cookies"])
+                # Read and parse off the event loop so other sessions keep running
+                storage_state = await asyncio.to_thread(_read_json_file, path)
+                await self.context.add_cookies(storage_state["cookies"])
     
     async def add_random_delays(self, min_delay: int = 100, max_delay: int = 500):
         """
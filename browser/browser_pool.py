@@ -0,0 +1,185 @@
+"""
+Browser Pool for Browser Automation
+
+This module keeps a single Playwright driver and a shared Chromium process
+alive across BrowserManager instances, so each manager only has to create
+a lightweight BrowserContext instead of launching a whole browser.
+"""
+
+import asyncio
+import json
+import weakref
+from playwright.async_api import async_playwright, Playwright, BrowserContext
+from typing import Optional, Dict, Any, Hashable
+
+
+# Number of contexts a browser may serve before it is relaunched
+DEFAULT_MAX_CONTEXTS_PER_BROWSER = 50
+
+
+class _PoolState:
+    """Driver, browsers and lock shared by the managers of one event loop."""
+
+    __slots__ = ('lock', 'playwright', 'browsers', 'users')
+
+    def __init__(self):
+        # Guards driver startup and browser launches against concurrent callers
+        self.lock = asyncio.Lock()
+
+        # Shared Playwright driver (started lazily on first use)
+        self.playwright: Optional[Playwright] = None
+
+        # Launched browsers keyed by their launch options
+        self.browsers: Dict[str, Dict[str, Any]] = {}
+
+        # Managers currently holding the driver through acquire_playwright()
+        self.users = 0
+
+
+# Pool state per event loop; Playwright objects can't be used from another loop,
+# and a loop's state goes away with the loop
+_POOL_STATES: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _PoolState]" = weakref.WeakKeyDictionary()
+
+
+def _state() -> _PoolState:
+    """Get the pool state of the running event loop, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    state = _POOL_STATES.get(loop)
+    if state is None:
+        state = _POOL_STATES[loop] = _PoolState()
+    return state
+
+
+def _pool_key(launch_kwargs: Dict[str, Any]) -> str:
+    """
+    Build a stable pool key from browser launch options.
+
+    Args:
+        launch_kwargs: Keyword arguments passed to chromium.launch()
+
+    Returns:
+        A string uniquely identifying the launch configuration
+    """
+    return json.dumps(launch_kwargs, sort_keys=True, default=str)
+
+
+async def _get_playwright_unlocked(state: _PoolState) -> Playwright:
+    """Start the shared Playwright driver if needed. Caller must hold the lock."""
+    if state.playwright is None:
+        state.playwright = await async_playwright().start()
+    return state.playwright
+
+
+async def get_playwright() -> Playwright:
+    """
+    Get the shared Playwright driver, starting it on first use.
+
+    Returns:
+        The Playwright instance shared on the running event loop
+    """
+    state = _state()
+    async with state.lock:
+        return await _get_playwright_unlocked(state)
+
+
+async def acquire_playwright() -> Playwright:
+    """
+    Get the shared Playwright driver and hold a reference to it.
+
+    Every call must be paired with release_playwright(); the driver and the
+    pooled browsers are shut down when the last reference is released.
+
+    Returns:
+        The Playwright instance shared on the running event loop
+    """
+    state = _state()
+    async with state.lock:
+        state.users += 1
+        return await _get_playwright_unlocked(state)
+
+
+async def release_playwright() -> None:
+    """Drop a reference taken with acquire_playwright(), shutting down after the last one."""
+    state = _state()
+    async with state.lock:
+        state.users = max(state.users - 1, 0)
+        if not state.users:
+            await _release_browser_unlocked(state)
+
+
+async def get_context(launch_kwargs: Dict[str, Any],
+                      context_options: Dict[str, Any],
+                      max_contexts_per_browser: int = DEFAULT_MAX_CONTEXTS_PER_BROWSER,
+                      setup_key: Hashable = None) -> BrowserContext:
+    """
+    Create a context on a shared browser for the given launch options.
+
+    The browser is launched if needed, and the context is created while the
+    pool is locked, so a browser is never recycled between being picked and
+    getting its new context. Once a browser has served max_contexts_per_browser
+    contexts and has none left open, it is closed and relaunched to release
+    memory accumulated by the renderer.
+
+    Args:
+        launch_kwargs: Keyword arguments passed to chromium.launch()
+        context_options: Keyword arguments passed to browser.new_context()
+        max_contexts_per_browser: Contexts to serve before recycling the browser
+        setup_key: Context-level setup (init script flags) the caller applies;
+                   callers with different setups don't share a browser
+
+    Returns:
+        A new context on a connected Playwright browser
+    """
+    key = _pool_key({"launch": launch_kwargs, "setup": setup_key})
+    state = _state()
+
+    async with state.lock:
+        entry = state.browsers.get(key)
+
+        if entry:
+            browser = entry["browser"]
+            exhausted = (entry["contexts_served"] >= max_contexts_per_browser
+                         and not browser.contexts)
+            if not browser.is_connected() or exhausted:
+                # Drop the stale browser and launch a fresh one below
+                state.browsers.pop(key, None)
+                if browser.is_connected():
+                    await browser.close()
+                entry = None
+
+        if not entry:
+            playwright = await _get_playwright_unlocked(state)
+            browser = await playwright.chromium.launch(**launch_kwargs)
+            entry = {"browser": browser, "contexts_served": 0}
+            state.browsers[key] = entry
+
+        context = await entry["browser"].new_context(**context_options)
+        entry["contexts_served"] += 1
+        return context
+
+
+async def _release_browser_unlocked(state: _PoolState) -> None:
+    """Close every pooled browser and stop the driver. Caller must hold the lock."""
+    for entry in state.browsers.values():
+        browser = entry["browser"]
+        if browser.is_connected():
+            await browser.close()
+    state.browsers.clear()
+
+    if state.playwright is not None:
+        await state.playwright.stop()
+        state.playwright = None
+
+
+async def release_browser() -> None:
+    """
+    Close every pooled browser and stop the shared Playwright driver of the running loop.
+
+    Does nothing while managers still hold the driver through acquire_playwright();
+    the last of them shuts the pool down when it releases its reference.
+    """
+    state = _state()
+
+    async with state.lock:
+        if not state.users:
+            await _release_browser_unlocked(state)
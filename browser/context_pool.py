@@ -0,0 +1,124 @@
+"""
+Context Pool for Browser Automation
+
+This module keeps a set of pre-created browser contexts on a shared browser
+so concurrent sessions can start without waiting for context creation.
+"""
+
+import asyncio
+from playwright.async_api import Browser, BrowserContext
+from typing import Optional, Dict, Any, List, Hashable
+
+
+class ContextPool:
+    """Hands out pre-warmed browser contexts and recycles them on release."""
+
+    def __init__(self,
+                 browser: Browser,
+                 min_size: int = 2,
+                 max_uses_per_context: int = 20,
+                 init_scripts: Optional[List[str]] = None,
+                 **context_options: Any):
+        """
+        Initialize the context pool.
+
+        Args:
+            browser: Browser the contexts are created on
+            min_size: Number of contexts to pre-create in start()
+            max_uses_per_context: Acquisitions after which a context is closed and replaced
+            init_scripts: Scripts registered on every context when it is created
+            context_options: Keyword arguments passed to browser.new_context()
+        """
+        self.browser = browser
+        self.min_size = min_size
+        self.max_uses_per_context = max_uses_per_context
+        self.init_scripts = init_scripts or []
+        self.context_options: Dict[str, Any] = context_options
+
+        # Idle contexts grouped by the setup tag they were handed out with, so a
+        # context only goes back to callers that set it up the same way
+        self._idle: Dict[Hashable, List[BrowserContext]] = {}
+        self._tags: Dict[BrowserContext, Hashable] = {}
+        self._uses: Dict[BrowserContext, int] = {}
+
+    async def _create_context(self) -> BrowserContext:
+        """Create a new context with the pool's options and init scripts."""
+        context = await self.browser.new_context(**self.context_options)
+        for script in self.init_scripts:
+            await context.add_init_script(script)
+        return context
+
+    async def start(self) -> "ContextPool":
+        """
+        Pre-create min_size contexts concurrently.
+
+        Returns:
+            The pool itself, for chaining
+        """
+        contexts = await asyncio.gather(*[self._create_context() for _ in range(self.min_size)])
+        # Fresh contexts have no caller setup yet and can go to any tag
+        self._idle.setdefault(None, []).extend(contexts)
+        return self
+
+    async def acquire(self, tag: Hashable = None) -> BrowserContext:
+        """
+        Get an idle context, creating a new one if the pool is empty.
+
+        Args:
+            tag: Identifies the context-level setup (init scripts) the caller
+                 applies; contexts are only reused by callers with the same tag
+
+        Returns:
+            A browser context with no open pages
+        """
+        idle = self._idle.get(tag) or self._idle.get(None)
+        context = idle.pop() if idle else await self._create_context()
+
+        self._tags[context] = tag
+        self._uses[context] = self._uses.get(context, 0) + 1
+        return context
+
+    async def release(self, context: BrowserContext) -> None:
+        """
+        Reset a context's session state and return it to the pool.
+
+        Args:
+            context: Context previously returned by acquire()
+        """
+        try:
+            # Clear web storage for the origins that are open, then drop the pages
+            for page in context.pages:
+                try:
+                    await page.evaluate("() => { localStorage.clear(); sessionStorage.clear(); }")
+                except Exception:
+                    pass
+                await page.close()
+            await context.clear_cookies()
+        except Exception:
+            # A context that can't be reset is not safe to hand out again
+            await self._discard(context)
+            return
+
+        # Recycle long-lived contexts so renderer state doesn't accumulate
+        if self._uses.get(context, 0) >= self.max_uses_per_context:
+            await self._discard(context)
+            self._idle.setdefault(None, []).append(await self._create_context())
+            return
+
+        self._idle.setdefault(self._tags.get(context), []).append(context)
+
+    async def _discard(self, context: BrowserContext) -> None:
+        """Close a context without returning it to the pool."""
+        self._uses.pop(context, None)
+        self._tags.pop(context, None)
+        try:
+            await context.close()
+        except Exception:
+            pass
+
+    async def close(self) -> None:
+        """Close every idle context in the pool."""
+        idle, self._idle = self._idle, {}
+        for contexts in idle.values():
+            for context in contexts:
+                await self._discard(context)
@@ -5,10 +5,81 @@ This module provides comprehensive functionality to detect and highlight
 interactive elements in the browser with colored bounding boxes.
 """
 
-from playwright.async_api import Page, ElementHandle
-from typing import Dict, Any, Optional, List, Union
-import os
+from __future__ import annotations
+
+from typing import Dict, Any, Optional, List, Tuple, Union, TYPE_CHECKING
+import asyncio
+import contextlib
+import functools
 import pathlib
+import re
+import weakref
+
+# Playwright types are only used in annotations
+if TYPE_CHECKING:
+    from playwright.async_api import Page, ElementHandle, Frame, JSHandle, BrowserContext
+
+
+# Highlighter script injected into every page, resolved once at import
+_JS_PATH = pathlib.Path(__file__).resolve().parent.parent / "static" / "js" / "element_highlighter.js"
+
+# Contexts that already have the highlighter init script registered
+_HIGHLIGHTED_CONTEXTS: "weakref.WeakSet[BrowserContext]" = weakref.WeakSet()
+
+# rgb()/rgba() color with comma or space separated channels
+_RGB_COLOR_RE = re.compile(r"rgba?\(\s*([^)]+?)\s*\)")
+
+# #rrggbb color
+_HEX_COLOR_RE = re.compile(r"#[0-9a-fA-F]{6}")
+
+# Page-side calls. The logic lives in element_highlighter.js; these one-line
+# trampolines are all that is sent per call
+_JS_GET_HIGHLIGHTER = "() => window.elementHighlighter"
+_JS_SCAN = "(eh, options) => eh.scanInteractiveElements(options)"
+_JS_REMOVE_ALL = "(eh) => eh.removeAllHighlights()"
+_JS_REMOVE_SOME = "(eh, indices) => eh.removeHighlights(indices)"
+_JS_ARE_INTERACTIVE = "(eh, selectors) => eh.areInteractiveElements(selectors)"
+_JS_IS_INTERACTIVE_HANDLE = "(el) => window.elementHighlighter.isInteractiveElement(el)"
+_JS_DRAW = "(eh, item) => eh.drawElementHighlight(item)"
+_JS_DRAW_MANY = "(eh, items) => eh.drawElementHighlights(items)"
+_JS_HIGHLIGHT_TEXT = "(eh, parentSelector) => eh.highlightAllText(parentSelector)"
+
+
+@functools.lru_cache(maxsize=1)
+def _load_highlighter_js() -> str:
+    """
+    Read element_highlighter.js once per process.
+
+    Returns:
+        The highlighter script source
+    """
+    return _JS_PATH.read_text()
+
+
+@functools.lru_cache(maxsize=64)
+def _highlight_colors(color: str) -> Tuple[str, str]:
+    """
+    Derive the fill and border colors for a highlight from a CSS color.
+
+    Args:
+        color: rgb()/rgba() or #rrggbb color; other CSS colors are used for the border only
+
+    Returns:
+        Tuple of (fill color, opaque border color)
+    """
+    match = _RGB_COLOR_RE.fullmatch(color.strip())
+    if match:
+        channels = [c for c in re.split(r"[\s,/]+", match.group(1)) if c]
+        if len(channels) >= 3:
+            rgb = ", ".join(channels[:3])
+            alpha = channels[3] if len(channels) > 3 else "0.1"
+            return f"rgba({rgb}, {alpha})", f"rgb({rgb})"
+
+    if _HEX_COLOR_RE.fullmatch(color.strip()):
+        # 10% opacity version of the color
+        return color.strip() + "1A", color.strip()
+
+    return "transparent", color
 
 
 class ElementHighlighter:
@@ -22,25 +93,80 @@ class ElementHighlighter:
             page: Playwright page object to work with
         """
         self.page = page
+        self._setup_task: Optional[asyncio.Future] = None
+
+        # Handle to window.elementHighlighter in the current document, fetched lazily
+        self._eh_handle: Optional[JSHandle] = None
+        self.page.on("framenavigated", self._on_frame_navigated)
+
+        # Highlights queued inside a batching() block, None when not batching
+        self._pending_highlights: Optional[List[Dict[str, Any]]] = None
+
+        # Result of the last interactive element scan, reused while the DOM is unchanged
+        self._last_dom_version: Optional[str] = None
+        self._last_scan_options: Optional[Dict[str, Any]] = None
+        self._last_count: int = 0
 
     async def setup(self):
-        """Set up the highlighter by injecting JavaScript."""
-        await self._setup_highlighter()
+        """
+        Set up the highlighter by injecting JavaScript.
+
+        Safe to call more than once or concurrently; the script is only injected once.
+        """
+        if self._setup_task is None:
+            self._setup_task = asyncio.ensure_future(self._setup_highlighter())
+        await self._setup_task
 
     async def _setup_highlighter(self):
         """Inject the highlighting JavaScript into the page."""
-        # Get the path to the JavaScript file
-        root_dir = pathlib.Path(__file__).parent.parent.absolute()
-        js_file_path = os.path.join(
-            root_dir, "static", "js", "element_highlighter.js")
+        # Pooled and CDP-attached contexts outlive a highlighter, so only register once
+        context = self.page.context
+        if context in _HIGHLIGHTED_CONTEXTS:
+            return
 
-        # Read the JavaScript file
-        with open(js_file_path, 'r') as file:
-            js_code = file.read()
+        # The file is read once per process and shared by every highlighter
+        if _load_highlighter_js.cache_info().currsize:
+            js_code = _load_highlighter_js()
+        else:
+            # First load reads the file in a worker thread so the event loop keeps running
+            js_code = await asyncio.to_thread(_load_highlighter_js)
 
-        # Inject the JavaScript into the page
-        await self.page.add_init_script(js_code)
+        # Register the JavaScript on the context so every page in it inherits it
+        if context in _HIGHLIGHTED_CONTEXTS:
+            return
+        await context.add_init_script(js_code)
+        _HIGHLIGHTED_CONTEXTS.add(context)
     
+    def _on_frame_navigated(self, frame: Frame) -> None:
+        """Drop the highlighter handle when the main frame loads a new document."""
+        if frame == self.page.main_frame:
+            self._eh_handle = None
+
+    async def _call(self, expression: str, arg: Any = None) -> Any:
+        """
+        Evaluate a function against the page's window.elementHighlighter.
+
+        The handle is reused across calls so only the function body is sent,
+        and is fetched again once if it went stale.
+
+        Args:
+            expression: Function taking (elementHighlighter, arg)
+            arg: Argument passed to the function
+
+        Returns:
+            The function's return value
+        """
+        for attempt in range(2):
+            if self._eh_handle is None:
+                self._eh_handle = await self.page.evaluate_handle(_JS_GET_HIGHLIGHTER)
+            try:
+                return await self._eh_handle.evaluate(expression, arg)
+            except Exception:
+                # The document changed under us; retry with a fresh handle
+                self._eh_handle = None
+                if attempt:
+                    raise
+
     async def find_and_highlight_interactive_elements(self, 
                                                      do_highlight: bool = True,
                                                      focus_highlight_index: int = -1,
@@ -67,42 +193,80 @@ class ElementHighlighter:
             "parentSelector": parent_selector
         }
 
-        return await self.page.evaluate("""
-            (options) => {
-                return window.elementHighlighter.findAndHighlightInteractiveElements(options);
-            }
-        """, options)
+        # The page skips the scan if the DOM hasn't changed since the last identical call
+        last_dom_version = self._last_dom_version if options == self._last_scan_options else None
+
+        result = await self._call(_JS_SCAN, {**options, "lastDomVersion": last_dom_version})
+
+        if result["count"] == -1:
+            return self._last_count
+
+        self._last_dom_version = result["domVersion"]
+        self._last_scan_options = options
+        self._last_count = result["count"]
+        return self._last_count
 
     async def remove_all_highlights(self) -> None:
         """Remove all highlights from the page."""
-        await self.page.evaluate("""
-            () => {
-                return window.elementHighlighter.removeAllHighlights();
-            }
-        """)
+        await self._call(_JS_REMOVE_ALL)
+
+    async def remove_highlights(self, indices: List[int]) -> int:
+        """
+        Remove the highlights of specific elements from the last scan.
 
-    async def is_element_interactive(self, selector: str) -> bool:
+        Args:
+            indices: Highlight indices as labelled by find_and_highlight_interactive_elements
+
+        Returns:
+            Number of highlights removed
+        """
+        if not indices:
+            return 0
+
+        return await self._call(_JS_REMOVE_SOME, indices)
+
+    async def is_element_interactive(self, element: Union[ElementHandle, str]) -> bool:
         """
         Check if an element is interactive.
 
+        Selectors are resolved inside the page with a cached querySelector,
+        which is cheaper than CDP DOM.* lookups; pass a handle you already
+        hold to skip the lookup entirely.
+
         Args:
-            selector: CSS selector for the element to check
+            element: ElementHandle or CSS selector for the element to check
 
         Returns:
             True if the element is interactive, False otherwise
         """
-        return await self.page.evaluate("""
-            (selector) => {
-                const element = document.querySelector(selector);
-                if (!element) return false;
-                return window.elementHighlighter.isInteractiveElement(element);
-            }
-        """, selector)
+        if isinstance(element, str):
+            results = await self.are_elements_interactive([element])
+            return results[0]
+
+        # A handle is passed straight to the page, no selector lookup needed
+        return await element.evaluate(_JS_IS_INTERACTIVE_HANDLE)
+
+    async def are_elements_interactive(self, selectors: List[str]) -> List[bool]:
+        """
+        Check whether several elements are interactive in a single page call.
+
+        Args:
+            selectors: CSS selectors for the elements to check
+
+        Returns:
+            List of booleans in the same order as the selectors; False for
+            selectors that match no element
+        """
+        if not selectors:
+            return []
+
+        return await self._call(_JS_ARE_INTERACTIVE, selectors)
 
     async def highlight_element(self, 
                                element: Union[ElementHandle, str], 
                                color: str = "rgba(0, 255, 0, 0.5)", 
-                               duration: int = 2000) -> None:
+                               duration: int = 2000,
+                               mode: str = "overlay") -> None:
         """
         Highlight an element with a colored overlay.
         
@@ -110,77 +274,73 @@ class ElementHighlighter:
             element: ElementHandle or CSS selector for the element to highlight
             color: CSS color for the highlight
             duration: Duration to show the highlight in ms (0 for indefinite)
+            mode: "overlay" draws a box over the element; "outline" sets an
+                  outline on the element itself, which skips the layout read
         """
-        # If element is a string (selector), get the element handle
-        if isinstance(element, str):
-            element_handle = await self.page.query_selector(element)
-            if not element_handle:
-                return  # Element not found
-        else:
-            element_handle = element
-
-        # Get the bounding box of the element
-        box = await element_handle.bounding_box()
-        if not box:
-            return  # Element not visible
-
-        # Create a highlight for the element
-        await self.page.evaluate("""
-            function(params) {
-                const box = params.box;
-                const color = params.color;
-                const duration = params.duration;
-                
-                // Create or get highlight container
-                let container = document.getElementById('highlight-container');
-                if (!container) {
-                    container = document.createElement("div");
-                    container.id = 'highlight-container';
-                    container.style.position = "fixed";
-                    container.style.pointerEvents = "none";
-                    container.style.top = "0";
-                    container.style.left = "0";
-                    container.style.width = "100%";
-                    container.style.height = "100%";
-                    container.style.zIndex = "2147483647";
-                    document.body.appendChild(container);
-                }
-                
-                // Generate a color based on the index
-                const COLORS = ["#FF5733", "#33FF57", "#3357FF", "#F3FF33", "#FF33F3", "#33FFF3"];
-                const colorIndex = 0; // Use first color for single element
-                const baseColor = COLORS[colorIndex];
-                const backgroundColor = baseColor + "1A"; // 10% opacity version of the color
-                
-                // Create a highlight element
-                const highlight = document.createElement("div");
-                highlight.style.position = "fixed";
-                highlight.style.left = `${box.x}px`;
-                highlight.style.top = `${box.y}px`;
-                highlight.style.width = `${box.width}px`;
-                highlight.style.height = `${box.height}px`;
-                highlight.style.backgroundColor = backgroundColor;
-                highlight.style.border = `2px solid ${baseColor}`;
-                highlight.style.boxSizing = "border-box";
-                highlight.style.pointerEvents = "none";
-                highlight.style.zIndex = "10000";
-                highlight.className = 'element-highlight';
-                
-                // Add the highlight to the container
-                container.appendChild(highlight);
-                
-                // Remove the highlight after the specified duration
-                if (duration > 0) {
-                    setTimeout(() => {
-                        if (highlight.parentNode) {
-                            highlight.parentNode.removeChild(highlight);
-                        }
-                    }, duration);
-                }
-                
-                return true;
-            }
-        """, {"box": box, "color": color, "duration": duration})
+        item = self._highlight_item(element, color, duration, mode)
+
+        # Inside batching(), defer the overlay so the batch is drawn in one call
+        if self._pending_highlights is not None:
+            self._pending_highlights.append(item)
+            return
+
+        # Look up the element, measure it and draw the overlay in a single page call
+        await self._call(_JS_DRAW, item)
+
+    @staticmethod
+    def _highlight_item(element: Union[ElementHandle, str],
+                        color: str,
+                        duration: int,
+                        mode: str = "overlay") -> Dict[str, Any]:
+        """Build the page-side description of one highlight."""
+        fill, border = _highlight_colors(color)
+        return {
+            "selector": element if isinstance(element, str) else None,
+            "element": None if isinstance(element, str) else element,
+            "fill": fill,
+            "border": border,
+            "duration": duration,
+            "mode": mode
+        }
+
+    async def highlight_batch(self, items: List[Tuple[Any, ...]]) -> None:
+        """
+        Highlight several elements with a single page call.
+
+        Args:
+            items: (ElementHandle or CSS selector, color, duration[, mode]) tuples,
+                   with the same meaning as highlight_element's arguments
+        """
+        await self._draw_highlights([self._highlight_item(*item) for item in items])
+
+    async def _draw_highlights(self, items: List[Dict[str, Any]]) -> None:
+        """Draw prepared highlight items in one page call."""
+        if not items:
+            return
+
+        await self._call(_JS_DRAW_MANY, items)
+
+    @contextlib.asynccontextmanager
+    async def batching(self):
+        """
+        Collect highlight_element calls and draw them together on exit.
+
+        Example:
+            async with highlighter.batching():
+                for handle in handles:
+                    await highlighter.highlight_element(handle)
+        """
+        if self._pending_highlights is not None:
+            # Already batching; the outermost block flushes
+            yield self
+            return
+
+        self._pending_highlights = []
+        try:
+            yield self
+        finally:
+            pending, self._pending_highlights = self._pending_highlights, None
+            await self._draw_highlights(pending)
         
     async def highlight_and_click(self, 
                                  selector: str, 
@@ -203,20 +363,26 @@ class ElementHighlighter:
         if not element:
             return False
 
-        # Highlight the element
-        await self.highlight_element(element, color, pre_click_delay)
-
-        # Wait before clicking
         if pre_click_delay > 0:
-            await self.page.wait_for_timeout(pre_click_delay)
-
-        # Click the element
-        await element.click()
+            # Highlight the element while the pre-click delay runs, then click
+            await asyncio.gather(
+                self.highlight_element(element, color, pre_click_delay),
+                self.page.wait_for_timeout(pre_click_delay)
+            )
+            await element.click()
+        else:
+            # No delay to show the highlight, so draw it and click concurrently
+            await asyncio.gather(
+                self.highlight_element(element, color, pre_click_delay),
+                element.click()
+            )
 
         # Highlight again after clicking with a different color
         if post_click_delay > 0:
-            await self.highlight_element(element, "rgba(255, 165, 0, 0.5)", post_click_delay)
-            await self.page.wait_for_timeout(post_click_delay)
+            await asyncio.gather(
+                self.highlight_element(element, "rgba(255, 165, 0, 0.5)", post_click_delay),
+                self.page.wait_for_timeout(post_click_delay)
+            )
 
         return True
 
@@ -230,8 +396,4 @@ class ElementHighlighter:
         Returns:
             Number of text nodes highlighted
         """
-        return await self.page.evaluate("""
-            (parentSelector) => {
-                return window.elementHighlighter.highlightAllText(parentSelector);
-            }
-        """, parent_selector)
+        return await self._call(_JS_HIGHLIGHT_TEXT, parent_selector)
@@ -6,35 +6,339 @@ built on top of Playwright's Page API.
 """
 
 import asyncio
-from playwright.async_api import Page, ElementHandle, TimeoutError
-from typing import Optional, List, Dict, Any, Union, Callable
+import functools
+from playwright.async_api import Page, ElementHandle, Frame, TimeoutError, Error
+from typing import Optional, List, Dict, Any, Union, Callable, Tuple
 import logging
+import random
 import re
+import time
 
 from .element_highlighter import ElementHighlighter
 
 
+# How long resolved elements are reused before the selector is queried again (seconds)
+SELECTOR_CACHE_TTL = 0.5
+
+# Element states whose results stay meaningful while cached; 'hidden' and
+# 'detached' describe a moment in time and are always waited for again
+_CACHEABLE_STATES = ("attached", "visible")
+
+# Whether an element is still part of its document
+_JS_IS_CONNECTED = "element => element.isConnected"
+
+# Share of pre_click_delay always waited before a click when behavior is
+# randomized, so clicks on an already-loaded page don't fire instantly
+PRE_CLICK_FLOOR_RANGE = (0.2, 0.5)
+
+# How long the DOM must go without mutations to count as settled after a click (ms)
+DOM_QUIET_PERIOD_MS = 100
+
+# Resolve once the document has gone quietMs without mutations, or after maxMs
+_JS_WAIT_FOR_DOM_QUIET = """
+    ([quietMs, maxMs]) => new Promise(resolve => {
+        const done = () => {
+            observer.disconnect();
+            clearTimeout(quietTimer);
+            clearTimeout(maxTimer);
+            resolve();
+        };
+        const observer = new MutationObserver(() => {
+            clearTimeout(quietTimer);
+            quietTimer = setTimeout(done, quietMs);
+        });
+        let quietTimer = setTimeout(done, quietMs);
+        const maxTimer = setTimeout(done, maxMs);
+        observer.observe(document, { subtree: true, childList: true, attributes: true, characterData: true });
+    })
+"""
+
+
+@functools.lru_cache(maxsize=128)
+def _compile_pattern(pattern: str) -> re.Pattern:
+    """Compile a URL pattern once and reuse it across calls."""
+    return re.compile(pattern)
+
+
+# Defines window.__yujinUniqueSelector, which builds a CSS selector that uniquely
+# identifies an element. Registered once per document so calls only send a trampoline
+_JS_UNIQUE_SELECTOR_INIT = """
+    (() => {
+        if (window.__yujinUniqueSelector) return;
+
+        // Escape CSS selector special characters; the regex is compiled once per document
+        const ESC = /[\\:\\.\\/\\[\\]]/g;
+        const escapeCSS = str => str.replace(ESC, '\\\\$&');
+
+        window.__yujinUniqueSelector = element => {
+            // Match counts per candidate selector, shared across calls until the
+            // DOM changes (tracked by the highlighter's DOM version when present)
+            const domVersion = window.elementHighlighter?.getDomVersion?.() ?? null;
+            if (!window.__uniqCache || domVersion === null || window.__uniqCacheVersion !== domVersion) {
+                window.__uniqCache = new Map();
+                window.__uniqCacheVersion = domVersion;
+            }
+            const qlen = s => {
+                if (window.__uniqCache.has(s)) return window.__uniqCache.get(s);
+                const n = document.querySelectorAll(s).length;
+                window.__uniqCache.set(s, n);
+                return n;
+            };
+
+            // Try to find a unique ID first
+            if (element.id) {
+                return '#' + escapeCSS(element.id);
+            }
+
+            // Prefer a test id when it is unique
+            const testId = element.getAttribute('data-testid');
+            if (testId) {
+                const testIdSelector = `[data-testid="${CSS.escape(testId)}"]`;
+                if (qlen(testIdSelector) === 1) {
+                    return testIdSelector;
+                }
+            }
+        
+            // Try using a unique class combination
+            if (element.classList && element.classList.length > 0) {
+                const classSelector = Array.from(element.classList).map(c => '.' + escapeCSS(c)).join('');
+                // Test if this selector is unique
+                if (qlen(classSelector) === 1) {
+                    return classSelector;
+                }
+            }
+        
+            // Try using tag name with attributes
+            const tagName = element.tagName.toLowerCase();
+        
+            // Check for common attributes that might be unique
+            for (const attr of ['data-testid', 'name', 'aria-label', 'role', 'type']) {
+                if (element.hasAttribute(attr)) {
+                    const attrValue = element.getAttribute(attr);
+                    const selector = `${tagName}[${attr}="${attrValue}"]`;
+                    if (qlen(selector) === 1) {
+                        return selector;
+                    }
+                }
+            }
+        
+            // If no unique selector found yet, use nth-child with parent context
+            let current = element;
+            let selector = tagName;
+            let iterations = 0;
+            const maxIterations = 5; // Prevent infinite loops
+        
+            while (qlen(selector) > 1 && iterations < maxIterations) {
+                // Find the index of the current element among its siblings
+                const parent = current.parentElement;
+                if (!parent) break;
+            
+                const siblings = Array.from(parent.children);
+                const index = siblings.indexOf(current) + 1;
+            
+                // Update the selector with nth-child
+                selector = `${tagName}:nth-child(${index})`;
+            
+                // Add parent context if needed
+                if (qlen(selector) > 1) {
+                    const parentTag = parent.tagName.toLowerCase();
+                    selector = `${parentTag} > ${selector}`;
+                    current = parent;
+                }
+            
+                iterations++;
+            }
+        
+            return selector;
+        };
+    })();
+"""
+
+# Page-side call to the selector builder above
+_JS_UNIQUE_SELECTOR = "element => window.__yujinUniqueSelector(element)"
+
+# Read the text of every element and, when asked, outline them with the
+# highlighter in the same page call
+_JS_READ_TEXTS = """
+    (elements, highlight) => {
+        if (highlight) {
+            window.elementHighlighter?.drawElementHighlights(elements.map(element => ({
+                selector: null,
+                element,
+                fill: "rgba(0, 255, 0, 0.5)",
+                border: "rgb(0, 255, 0)",
+                duration: 300,
+                mode: "outline"
+            })));
+        }
+        return elements.map(element => element.textContent);
+    }
+"""
+
+# Set the value of every [selector, value] pair in one pass and return the
+# selectors that matched nothing. The prototype's value setter is used so
+# frameworks that track input values (e.g. React) see the change
+_JS_FILL_FIELDS = """
+    (pairs) => {
+        const missing = [];
+        for (const [selector, value] of pairs) {
+            const element = document.querySelector(selector);
+            if (!element) {
+                missing.push(selector);
+                continue;
+            }
+            element.focus();
+            if (element.isContentEditable) {
+                element.textContent = value;
+            } else {
+                const setter = Object.getOwnPropertyDescriptor(
+                    Object.getPrototypeOf(element), "value")?.set;
+                if (setter) {
+                    setter.call(element, value);
+                } else {
+                    element.value = value;
+                }
+            }
+            element.dispatchEvent(new Event("input", { bubbles: true }));
+            element.dispatchEvent(new Event("change", { bubbles: true }));
+        }
+        return missing;
+    }
+"""
+
+
 class PageController:
     """Provides enhanced page interaction capabilities."""
 
-    def __init__(self, page: Page, highlighter: Optional[ElementHighlighter] = None):
+    def __init__(self, page: Page, highlighter: Optional[ElementHighlighter] = None,
+                 randomize_behavior: bool = True):
         """
         Initialize the page controller.
 
         Args:
             page: Playwright page object
             highlighter: Optional element highlighter instance
+            randomize_behavior: Whether to add human-like random delays to clicks
         """
         self.page = page
         self.highlighter = highlighter or ElementHighlighter(page)
+        self.randomize_behavior = randomize_behavior
         self.logger = logging.getLogger("PageController")
 
+        # Recently resolved elements keyed by (selector, state), so back-to-back
+        # calls on the same selector don't query the DOM again
+        self._sel_cache: Dict[Tuple[str, str], Tuple[float, List[ElementHandle]]] = {}
+        self.page.on("framenavigated", self._on_frame_navigated)
+
+        # Highlight animations run in the background; drain_highlights() waits for them
+        self._pending_highlights: List[asyncio.Task] = []
+
+    async def _on_frame_navigated(self, frame: Frame) -> None:
+        """Drop cached elements when the main frame loads a new document."""
+        if frame == self.page.main_frame:
+            await self._cache_clear()
+
+    async def _dispose(self, elements: List[ElementHandle]) -> None:
+        """Release element handles in the page, ignoring ones already gone."""
+        await asyncio.gather(*(element.dispose() for element in elements), return_exceptions=True)
+
+    async def _cache_clear(self) -> None:
+        """Forget every cached element and release its handle."""
+        entries, self._sel_cache = self._sel_cache, {}
+        await self._dispose([element for _, elements in entries.values() for element in elements])
+
+    async def _cache_evict(self, key: Tuple[str, str], entry: Tuple[float, List[ElementHandle]]) -> None:
+        """Forget a cache entry, unless it was replaced meanwhile, and release its handles."""
+        if self._sel_cache.get(key) is entry:
+            del self._sel_cache[key]
+        await self._dispose(entry[1])
+
+    async def _cache_get(self, selector: str, state: str) -> Optional[List[ElementHandle]]:
+        """Get cached elements for a selector if they are fresh and still in the document."""
+        key = (selector, state)
+        entry = self._sel_cache.get(key)
+        if not entry:
+            return None
+
+        if time.monotonic() - entry[0] < SELECTOR_CACHE_TTL:
+            try:
+                connected = await asyncio.gather(
+                    *(element.evaluate(_JS_IS_CONNECTED) for element in entry[1]))
+                if all(connected):
+                    return entry[1]
+            except Error:
+                # The handle's document is gone
+                pass
+
+        await self._cache_evict(key, entry)
+        return None
+
+    async def _cache_put(self, selector: str, state: str, elements: List[ElementHandle]) -> None:
+        """Remember the elements a selector resolved to, releasing the ones they replace."""
+        key = (selector, state)
+        previous = self._sel_cache.get(key)
+        self._sel_cache[key] = (time.monotonic(), elements)
+        if previous:
+            await self._dispose([element for element in previous[1] if element not in elements])
+
+    async def _resolve(self, selector: str, state: str, timeout: int) -> Optional[ElementHandle]:
+        """
+        Wait for the first element matching a selector, reusing a fresh cached result.
+
+        Args:
+            selector: CSS selector for the element
+            state: Element state to wait for
+            timeout: Maximum time to wait in milliseconds
+
+        Returns:
+            Element handle, or None for the 'detached'/'hidden' states
+        """
+        if state not in _CACHEABLE_STATES:
+            return await self.page.wait_for_selector(selector, state=state, timeout=timeout)
+
+        cached = await self._cache_get(selector, state)
+        if cached:
+            return cached[0]
+
+        # wait_for_selector already returns the element, no second query needed
+        element = await self.page.wait_for_selector(selector, state=state, timeout=timeout)
+        if element:
+            await self._cache_put(selector, state, [element])
+        return element
+
+    def highlight_in_background(self, coro) -> None:
+        """
+        Start a purely visual highlight without waiting for it.
+
+        Errors are ignored; call drain_highlights() before tearing down the page.
+
+        Args:
+            coro: Highlight coroutine to run
+        """
+        self._pending_highlights = [task for task in self._pending_highlights if not task.done()]
+        self._pending_highlights.append(asyncio.create_task(coro))
+
+    async def drain_highlights(self) -> None:
+        """Wait for background highlights to finish, ignoring their errors."""
+        pending, self._pending_highlights = self._pending_highlights, []
+        await asyncio.gather(*pending, return_exceptions=True)
+
     async def setup(self):
-        """Set up the controller and its dependencies."""
-        # If we created our own highlighter, we need to set it up
-        if self.highlighter and not hasattr(self.highlighter, '_initialized'):
-            await self.highlighter.setup()
-            setattr(self.highlighter, '_initialized', True)
+        """
+        Set up the controller and its highlighter.
+
+        Callers only need this; the highlighter is set up here, and its setup
+        is idempotent if it already ran.
+        """
+        async def setup_selector_builder():
+            # Register the selector builder for future documents and define it in the current one
+            await self.page.context.add_init_script(_JS_UNIQUE_SELECTOR_INIT)
+            await self.page.evaluate(_JS_UNIQUE_SELECTOR_INIT)
+
+        if self.highlighter:
+            await asyncio.gather(setup_selector_builder(), self.highlighter.setup())
+        else:
+            await setup_selector_builder()
     
     async def navigate(self, url: str, wait_until: str = "domcontentloaded", timeout: int = 60000) -> bool:
         """
@@ -73,6 +377,7 @@ class PageController:
             # Add some random scrolling and mouse movements to appear more human-like
             await self._perform_human_like_behavior()
             
+            await self._cache_clear()
             self.logger.info(f"Successfully navigated to {url}")
             return True
         except TimeoutError:
@@ -152,11 +457,11 @@ class PageController:
             Element handle if found, None otherwise
         """
         try:
-            await self.page.wait_for_selector(selector, state=state, timeout=timeout)
-            element = await self.page.query_selector(selector)
+            element = await self._resolve(selector, state, timeout)
 
             if element and highlight and self.highlighter:
-                await self.highlighter.highlight(selector, duration=1000)
+                self.highlight_in_background(
+                    self.highlighter.highlight_element(element, duration=1000))
 
             return element
         except TimeoutError:
@@ -190,13 +495,12 @@ class PageController:
         Returns:
             True if the click was successful, False otherwise
         """
-        element = await self.wait_for_element(selector, timeout, highlight=False)
-
-        if not element:
-            return False
-
         try:
             if highlight and self.highlighter:
+                element = await self.wait_for_element(selector, timeout, highlight=False)
+                if not element:
+                    return False
+
                 await self.highlighter.highlight_and_click(
                     selector,
                     color=highlight_color,
@@ -204,38 +508,89 @@ class PageController:
                     post_click_delay=post_click_delay
                 )
             else:
+                # The delays are upper bounds; proceed as soon as the page has settled,
+                # but keep a short random pause so clicks still look human
                 if pre_click_delay > 0:
-                    await self.page.wait_for_timeout(pre_click_delay)
+                    floor = random.uniform(*PRE_CLICK_FLOOR_RANGE) * pre_click_delay if self.randomize_behavior else 0
+                    await asyncio.gather(
+                        self._wait_until_settled("load", pre_click_delay),
+                        asyncio.sleep(floor / 1000)
+                    )
 
-                await element.click(force=force)
+                # The locator waits for the element and clicks it in one call; .first
+                # keeps wait_for_selector's first-match behavior instead of strict mode
+                await self.page.locator(selector).first.click(force=force, timeout=timeout)
 
                 if post_click_delay > 0:
-                    await self.page.wait_for_timeout(post_click_delay)
+                    await self._wait_for_dom_quiet(post_click_delay)
 
             return True
         except Exception as e:
             self.logger.error(f"Failed to click element {selector}: {str(e)}")
             return False
 
+    async def _wait_until_settled(self, state: str, timeout: int) -> None:
+        """
+        Wait for the page to reach a load state, giving up quietly after a timeout.
+
+        Args:
+            state: Load state to wait for ("load", "domcontentloaded" or "networkidle")
+            timeout: Maximum time to wait in milliseconds
+        """
+        try:
+            await self.page.wait_for_load_state(state, timeout=timeout)
+        except TimeoutError:
+            pass
+
+    async def _wait_for_dom_quiet(self, timeout: int) -> None:
+        """
+        Wait for the DOM to stop changing, e.g. after a click re-renders part of the page.
+
+        Pages that keep long-lived connections open never reach networkidle, so
+        this watches mutations instead.
+
+        Args:
+            timeout: Maximum time to wait in milliseconds
+        """
+        try:
+            await self.page.evaluate(_JS_WAIT_FOR_DOM_QUIET, [min(DOM_QUIET_PERIOD_MS, timeout), timeout])
+        except Error:
+            # The click navigated away and the old document is gone
+            pass
+
     async def fill_form(self,
                         form_data: Dict[str, str],
                         submit_selector: Optional[str] = None,
-                        highlight: bool = True) -> bool:
+                        highlight: bool = True,
+                        realistic_typing: bool = False) -> bool:
         """
         Fill a form with the provided data and optionally submit it.
 
+        Unless highlighting or realistic typing is requested, all fields present
+        on the page are set in a single page call; fields that aren't there yet
+        are waited for and typed individually.
+
         Args:
             form_data: Dictionary mapping selectors to values
             submit_selector: Optional selector for submit button
             highlight: Whether to highlight elements during interaction
+            realistic_typing: Whether to type every value key by key
 
         Returns:
             True if form was filled (and submitted if requested), False otherwise
         """
         success = True
+        pending = form_data
+
+        if not highlight and not realistic_typing:
+            try:
+                missing = await self.page.evaluate(_JS_FILL_FIELDS, list(form_data.items()))
+                pending = {selector: form_data[selector] for selector in missing}
+            except Exception as e:
+                self.logger.error(f"Failed to fill form fields in one pass: {str(e)}")
 
-        # Fill each field
-        for selector, value in form_data.items():
+        # Fill each remaining field
+        for selector, value in pending.items():
             try:
                 element = await self.wait_for_element(selector, highlight=highlight)
 
@@ -304,21 +659,17 @@ class PageController:
             List of text content from matching elements
         """
         try:
-            await self.page.wait_for_selector(selector, timeout=timeout)
-            elements = await self.page.query_selector_all(selector)
+            locator = self.page.locator(selector)
+            highlight = bool(highlight and self.highlighter)
 
-            results = []
-            for i, element in enumerate(elements):
-                if highlight and self.highlighter:
-                    # Create a more specific selector for this element
-                    specific_selector = f"{selector}:nth-of-type({i+1})"
-                    await self.highlighter.highlight(specific_selector, duration=300)
+            # Read every text and outline the elements in one page call, and
+            # only wait for the elements if none are there yet
+            texts = await locator.evaluate_all(_JS_READ_TEXTS, highlight)
+            if not texts:
+                await locator.first.wait_for(state="visible", timeout=timeout)
+                texts = await locator.evaluate_all(_JS_READ_TEXTS, highlight)
 
-                text = await element.text_content()
-                if text:
-                    results.append(text.strip())
-
-            return results
+            return [text.strip() for text in texts if text]
         except Exception as e:
             self.logger.error(
                 f"Failed to get elements text for {selector}: {str(e)}")
@@ -327,24 +678,26 @@ class PageController:
     async def wait_for_navigation(self,
                                   timeout: int = 30000,
                                   wait_until: str = "networkidle",
-                                  url_pattern: Optional[str] = None) -> bool:
+                                  url_pattern: Optional[Union[str, re.Pattern]] = None) -> bool:
         """
         Wait for navigation to complete, optionally matching a URL pattern.
 
         Args:
             timeout: Maximum time to wait in milliseconds
             wait_until: Navigation wait condition
-            url_pattern: Optional regex pattern the new URL should match
+            url_pattern: Optional regex pattern (string or compiled) the new URL should match
 
         Returns:
             True if navigation completed successfully, False otherwise
         """
         try:
             await self.page.wait_for_load_state(wait_until, timeout=timeout)
+            await self._cache_clear()
 
             if url_pattern:
                 current_url = self.page.url
-                if not re.search(url_pattern, current_url):
+                pattern = url_pattern if isinstance(url_pattern, re.Pattern) else _compile_pattern(url_pattern)
+                if not pattern.search(current_url):
                     self.logger.warning(
                         f"URL after navigation ({current_url}) doesn't match pattern: {url_pattern}")
                     return False
@@ -386,145 +739,8 @@ class PageController:
             A CSS selector string that uniquely identifies the element, or None if failed
         """
         try:
-            # Try to get a unique selector using Playwright's built-in functionality
-            return await element.evaluate("""element => {
-                // Helper function to escape CSS selector special characters
-                const escapeCSS = str => str.replace(/[\\:\\.\\/\\[\\]]/g, '\\\\$&');
-                
-                // Try to find a unique ID first
-                if (element.id) {
-                    return '#' + escapeCSS(element.id);
-                }
-                
-                // Try using a unique class combination
-                if (element.classList && element.classList.length > 0) {
-                    const classSelector = Array.from(element.classList).map(c => '.' + escapeCSS(c)).join('');
-                    // Test if this selector is unique
-                    if (document.querySelectorAll(classSelector).length === 1) {
-                        return classSelector;
-                    }
-                }
-                
-                // Try using tag name with attributes
-                const tagName = element.tagName.toLowerCase();
-                
-                // Check for common attributes that might be unique
-                for (const attr of ['data-testid', 'name', 'aria-label', 'role', 'type']) {
-                    if (element.hasAttribute(attr)) {
-                        const attrValue = element.getAttribute(attr);
-                        const selector = `${tagName}[${attr}="${attrValue}"]`;
-                        if (document.querySelectorAll(selector).length === 1) {
-                            return selector;
-                        }
-                    }
-                }
-                
-                // If no unique selector found yet, use nth-child with parent context
-                let current = element;
-                let selector = tagName;
-                let iterations = 0;
-                const maxIterations = 5; // Prevent infinite loops
-                
-                while (document.querySelectorAll(selector).length > 1 && iterations < maxIterations) {
-                    // Find the index of the current element among its siblings
-                    const parent = current.parentElement;
-                    if (!parent) break;
-                    
-                    const siblings = Array.from(parent.children);
-                    const index = siblings.indexOf(current) + 1;
-                    
-                    // Update the selector with nth-child
-                    selector = `${tagName}:nth-child(${index})`;
-                    
-                    // Add parent context if needed
-                    if (document.querySelectorAll(selector).length > 1) {
-                        const parentTag = parent.tagName.toLowerCase();
-                        selector = `${parentTag} > ${selector}`;
-                        current = parent;
-                    }
-                    
-                    iterations++;
-                }
-                
-                return selector;
-            }""")
-        except Exception as e:
-            self.logger.error(f"Failed to get unique selector: {str(e)}")
-            return None
-
-    async def get_unique_selector(self, element: ElementHandle) -> Optional[str]:
-        """
-        Generate a unique CSS selector for an element.
-
-        Args:
-            element: Playwright ElementHandle to generate selector for
-
-        Returns:
-            A CSS selector string that uniquely identifies the element, or None if failed
-        """
-        try:
-            # Try to get a unique selector using Playwright's built-in functionality
-            return await element.evaluate("""element => {
-                // Helper function to escape CSS selector special characters
-                const escapeCSS = str => str.replace(/[\\:\\.\\/\\[\\]]/g, '\\\\$&');
-                
-                // Try to find a unique ID first
-                if (element.id) {
-                    return '#' + escapeCSS(element.id);
-                }
-                
-                // Try using a unique class combination
-                if (element.classList && element.classList.length > 0) {
-                    const classSelector = Array.from(element.classList).map(c => '.' + escapeCSS(c)).join('');
-                    // Test if this selector is unique
-                    if (document.querySelectorAll(classSelector).length === 1) {
-                        return classSelector;
-                    }
-                }
-                
-                // Try using tag name with attributes
-                const tagName = element.tagName.toLowerCase();
-                
-                // Check for common attributes that might be unique
-                for (const attr of ['data-testid', 'name', 'aria-label', 'role', 'type']) {
-                    if (element.hasAttribute(attr)) {
-                        const attrValue = element.getAttribute(attr);
-                        const selector = `${tagName}[${attr}="${attrValue}"]`;
-                        if (document.querySelectorAll(selector).length === 1) {
-                            return selector;
-                        }
-                    }
-                }
-                
-                // If no unique selector found yet, use nth-child with parent context
-                let current = element;
-                let selector = tagName;
-                let iterations = 0;
-                const maxIterations = 5; // Prevent infinite loops
-                
-                while (document.querySelectorAll(selector).length > 1 && iterations < maxIterations) {
-                    // Find the index of the current element among its siblings
-                    const parent = current.parentElement;
-                    if (!parent) break;
-                    
-                    const siblings = Array.from(parent.children);
-                    const index = siblings.indexOf(current) + 1;
-                    
-                    // Update the selector with nth-child
-                    selector = `${tagName}:nth-child(${index})`;
-                    
-                    // Add parent context if needed
-                    if (document.querySelectorAll(selector).length > 1) {
-                        const parentTag = parent.tagName.toLowerCase();
-                        selector = `${parentTag} > ${selector}`;
-                        current = parent;
-                    }
-                    
-                    iterations++;
-                }
-                
-                return selector;
-            }""")
+            # Build the selector in the page; id and test id are tried before the costly fallbacks
+            return await element.evaluate(_JS_UNIQUE_SELECTOR)
         except Exception as e:
             self.logger.error(f"Failed to get unique selector: {str(e)}")
             return None
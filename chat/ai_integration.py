@@ -6,21 +6,42 @@ This module handles integration with OpenAI for generating chat responses.
 
 import os
 import json
-from typing import List, Dict, Any, Optional
+import functools
+from typing import List, Dict, Any, Optional, AsyncIterator
 import logging
-from openai import OpenAI
+from openai import AsyncOpenAI
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
 
-# Retrieve the OpenAI API key from environment variables
-api_key = os.getenv("OPENAI_API_KEY")
+@functools.lru_cache(maxsize=1)
+def _load_env() -> None:
+    """Load environment variables from the .env file, once per process."""
+    load_dotenv()
 
 
 class AIAssistant:
     """Handles integration with OpenAI for chat responses."""
 
+    # System prompt sent first in every request
+    _SYSTEM_MESSAGE = {
+        "role": "system",
+        "content": """
+        You are helping a friend response to messages on a dating app. 
+        Keep responses concise and natural, as if you were sending a text (use abbreviations, no capitalization).
+        Be as flirtatious as possible, and try to get their number so the romance can continue.
+        Don't include any additional text.
+        """,
+    }
+
+    # Final user message asking for a response
+    _RESPONSE_REQUEST = {
+        "role": "user",
+        "content": "Please provide a thoughtful response to continue this conversation."
+    }
+
+    # Messages from the match are the user's turns; everything else is ours
+    _ROLE_FOR_SENDER = {"match": "user"}.get
+
     def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4o-mini"):
         """
         Initialize the AI assistant.
@@ -29,13 +50,16 @@ class AIAssistant:
             api_key: OpenAI API key (defaults to OPENAI_API_KEY environment variable)
             model: OpenAI model to use
         """
+        # The .env file is only read when no key is passed in
+        if not api_key:
+            _load_env()
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not self.api_key:
             raise ValueError(
                 "OpenAI API key is required. Set OPENAI_API_KEY environment variable or pass it directly.")
 
         self.model = model
-        self.client = OpenAI(api_key=api_key)
+        self.client = AsyncOpenAI(api_key=self.api_key)
         self.logger = logging.getLogger("AIAssistant")
 
     def format_conversation(self, messages: List[Dict[str, str]]) -> List[Dict[str, str]]:
@@ -48,33 +72,15 @@ class AIAssistant:
         Returns:
             Formatted messages for OpenAI API
         """
-        formatted_messages = [
-            {
-                "role": "system", 
-                "content": """
-                You are helping a friend response to messages on a dating app. 
-                Keep responses concise and natural, as if you were sending a text (use abbreviations, no capitalization).
-                Be as flirtatious as possible, and try to get their number so the romance can continue.
-                Don't include any additional text.
-                """,
-            }
+        # Only the conversation turns are built per call; the system prompt and
+        # closing request are shared, since the client never mutates them
+        return [
+            self._SYSTEM_MESSAGE,
+            *({"role": self._ROLE_FOR_SENDER(msg["sender"], "assistant"), "content": msg["text"]}
+              for msg in messages),
+            self._RESPONSE_REQUEST
         ]
 
-        for msg in messages:
-            role = "user" if msg["sender"] == "match" else "assistant"
-            formatted_messages.append({
-                "role": role,
-                "content": msg["text"]
-            })
-
-        # Add a final user message asking for a response
-        formatted_messages.append({
-            "role": "user",
-            "content": "Please provide a thoughtful response to continue this conversation."
-        })
-
-        return formatted_messages
-
     async def generate_response(self, conversation: List[Dict[str, str]], testing: bool = False) -> str:
         """
         Generate a response based on the conversation.
@@ -93,9 +99,9 @@ class AIAssistant:
             formatted_messages = self.format_conversation(conversation)
 
             self.logger.info(
-                f"Sending request to OpenAI with {len(formatted_messages)} messages")
+                "Sending request to OpenAI with %d messages", len(formatted_messages))
 
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=formatted_messages,
                 max_tokens=150,
@@ -103,9 +109,56 @@ class AIAssistant:
             )
 
             reply = response.choices[0].message.content.strip()
-            self.logger.info(f"Generated response: {reply[:50]}...")
+            self.logger.info("Generated response: %.50s...", reply)
 
             return reply
         except Exception as e:
-            self.logger.error(f"Error generating AI response: {str(e)}")
+            self.logger.error("Error generating AI response: %s", e)
             return "I'm having trouble connecting to my brain right now. Let me try again later!"
+
+    async def stream_response(self, conversation: List[Dict[str, str]], testing: bool = False) -> AsyncIterator[str]:
+        """
+        Generate a response based on the conversation, yielding text as it arrives.
+
+        Args:
+            conversation: List of message dictionaries with 'sender' and 'text' keys
+
+        Yields:
+            Pieces of the generated response text, in order
+        """
+        # For testing purposes
+        if testing:
+            yield "This is a test response."
+            return
+
+        started = False
+        try:
+            formatted_messages = self.format_conversation(conversation)
+
+            self.logger.info(
+                "Streaming request to OpenAI with %d messages", len(formatted_messages))
+
+            stream = await self.client.chat.completions.create(
+                model=self.model,
+                messages=formatted_messages,
+                max_tokens=150,
+                temperature=0.7,
+                stream=True
+            )
+
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                piece = chunk.choices[0].delta.content or ""
+
+                # Match generate_response, which strips leading whitespace
+                if not started:
+                    piece = piece.lstrip()
+                if piece:
+                    started = True
+                    yield piece
+        except Exception as e:
+            self.logger.error("Error streaming AI response: %s", e)
+            # Only fall back if nothing has been sent to the caller yet
+            if not started:
+                yield "I'm having trouble connecting to my brain right now. Let me try again later!"
@@ -5,54 +5,114 @@ This script automates reading Bumble conversations, generating AI responses,
 and sending them back to the chat.
 """
 
-from utils.config import Config
 from chat.ai_integration import AIAssistant
 from browser.page_controller import PageController
 from browser.element_highlighter import ElementHighlighter
-from browser.browser_manager import BrowserManager
-from playwright.async_api import Page, ElementHandle
+from playwright.async_api import Page, ElementHandle, TimeoutError
 import asyncio
 import random
 import os
 import sys
-from typing import List, Dict, Any, Optional
+import weakref
+from typing import List, Dict, Any, Optional, AsyncIterator
 import logging
 
 
-async def browser_init():
-    """Setup browser automation."""
+# Characters at the end of a message that are typed key by key; the rest is inserted at once
+HUMAN_TYPED_TAIL_CHARS = 10
 
-    config = Config()
+# Insert text at the caret of an input, textarea or contenteditable element
+_INSERT_TEXT_JS = """
+    (element, text) => {
+        element.focus();
+        if (element.isContentEditable) {
+            document.execCommand("insertText", false, text);
+            return;
+        }
+        const setter = Object.getOwnPropertyDescriptor(
+            Object.getPrototypeOf(element), "value")?.set;
+        const value = element.value + text;
+        if (setter) {
+            setter.call(element, value);
+        } else {
+            element.value = value;
+        }
+        element.dispatchEvent(new InputEvent("input", { bubbles: true, inputType: "insertText", data: text }));
+    }
+"""
+
+
+# Direction and trimmed text of every message element
+_READ_MESSAGES_JS = """
+    elements => elements.map(element => ({
+        is_self: element.classList.contains('message--out'),
+        text: (element.textContent || '').trim()
+    }))
+"""
+
+# The editable element of the chat input: the wrapper itself when it is
+# contenteditable, otherwise the textarea or contenteditable inside it
+_CHAT_INPUT_SELECTOR = ", ".join([
+    "div[data-qa-role='chat-input'][contenteditable]:not([contenteditable='false'])",
+    "div[data-qa-role='chat-input'] textarea",
+    "div[data-qa-role='chat-input'] [contenteditable]:not([contenteditable='false'])",
+])
+
+# Whether an input, textarea or contenteditable element holds no text
+_INPUT_IS_EMPTY_JS = """
+    element => !("value" in element ? element.value : element.innerText).trim()
+"""
 
-    # Initialize the browser
-    browser_manager = BrowserManager(
-        headless=config.get("browser.headless", False),
-        slow_mo=config.get("browser.slow_mo", 50),
-        viewport_size=config.get("browser.viewport_size", {
-                                 "width": 1920, "height": 1080}),
-        user_agent=config.get("browser.user_agent"),
-        enable_stealth_mode=config.get("browser.stealth_mode", True),
-        randomize_behavior=config.get("browser.randomize_behavior", True),
-        bypass_webdriver_flags=config.get(
-            "browser.bypass_webdriver_flags", True),
-        proxy=config.get("browser.proxy"),
-    )
+# Logger for the chat flow
+logger = logging.getLogger("Chat")
 
-    # Initialize the highlighter and page controller
-    page = await browser_manager.start()
-    highlighter = ElementHighlighter(page)
-    await highlighter.setup()  # Call the setup method to initialize the highlighter
-    controller = PageController(page, highlighter)
-    await controller.setup()  # Call the setup method on the controller
 
-    return browser_manager, page, highlighter, controller
+# One AI assistant per event loop; its OpenAI client's connections belong to
+# the loop that opened them and can't be reused from another one
+_AI_ASSISTANTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AIAssistant]" = weakref.WeakKeyDictionary()
+
+
+def get_ai_assistant() -> AIAssistant:
+    """
+    Get the running event loop's AI assistant, creating it on first use.
+
+    Reusing one instance keeps the OpenAI client's connection pool warm
+    across messages.
+
+    Returns:
+        The AIAssistant instance for the running event loop
+    """
+    loop = asyncio.get_running_loop()
+    assistant = _AI_ASSISTANTS.get(loop)
+    if assistant is None:
+        assistant = _AI_ASSISTANTS[loop] = AIAssistant()
+    return assistant
 
 
-async def navigate_to_bumble(controller: PageController):
-    # Navigate to Bumble (assuming logged in) and wait for page to load
+async def _highlight_messages(controller: PageController, highlighter: ElementHighlighter):
+    """Highlight every message element in a single batch."""
+    message_elements = await controller.page.query_selector_all("div.message")
+    await highlighter.highlight_batch(
+        [(element, "rgba(0, 255, 0, 0.3)", 3000) for element in message_elements])
+
+
+async def navigate_to_bumble(controller: PageController, timeout: int = 10000):
+    """
+    Navigate to Bumble (assuming logged in) and wait for the contact list.
+
+    Args:
+        controller: Page controller for the chat page
+        timeout: Maximum time to wait for the contact list in milliseconds
+    """
+    # navigate() already waits for domcontentloaded
     await controller.navigate("https://bumble.com/app")
-    await controller.page.wait_for_load_state("domcontentloaded")
-    await controller.page.wait_for_timeout(2000)
+
+    # Continue as soon as the contact list renders; the app keeps network
+    # connections open, so waiting for network idle would stall
+    try:
+        await controller.page.wait_for_selector("div.contact", timeout=timeout)
+    except TimeoutError:
+        logger.warning("Contact list did not appear within %d ms", timeout)
 
 
 async def get_latest_conversation(controller: PageController, highlighter: ElementHighlighter) -> List[Dict[str, str]]:
@@ -80,32 +140,27 @@ async def get_latest_conversation(controller: PageController, highlighter: Eleme
                 post_click_delay=1000   # Wait 1 second after clicking
             )
     except Exception as e:
-        print(f"Error selecting next conversation: {str(e)}")
-
-    # Get all message elements
-    message_elements = await controller.page.locator("div.message").all()
-    conversation = []
-    for msg_element in message_elements:
-        # Highlight the message element
-        await highlighter.highlight_element(msg_element,
-            color="rgba(0, 255, 0, 0.3)",
-            duration=3000)
-        # Determine if message is from self or other person
-        is_self = await msg_element.evaluate("""
-            element => element.classList.contains('message--out')
-        """)
-        text = await msg_element.text_content()
-        # Clean up the text content
-        text = text.strip()
-        # Skip empty messages
-        if text:
+        logger.warning("Error selecting next conversation: %s", e)
+
+    # Read every message's direction and text in one page call
+    messages = await controller.page.locator("div.message").evaluate_all(_READ_MESSAGES_JS)
+
+    # Highlighting is purely visual, so let it run while the conversation is processed;
+    # chat_to_latest waits for it through drain_highlights()
+    controller.highlight_in_background(_highlight_messages(controller, highlighter))
+
+    conversation = [
+        {
             # Determine sender based on message direction
-            sender = "self" if is_self else "match"
-            # Add message to conversation
-            conversation.append({
-                "sender": sender,
-                "text": text
-            })
+            "sender": "self" if message["is_self"] else "match",
+            "text": text
+        }
+        for message in messages
+        # Collapse the newlines and space runs Bumble puts around emoji
+        for text in (" ".join(message["text"].split()),)
+        # Skip empty messages
+        if text
+    ]
 
     return conversation
 
@@ -116,33 +171,55 @@ async def generate_and_send_response(
     conversation: List[Dict[str, str]],
     testing: bool
 ):
-    # Initialize AI assistant
-    ai_assistant = AIAssistant()
+    # Shared AI assistant, so its HTTP connections are reused between messages
+    ai_assistant = get_ai_assistant()
 
-    # Generate response
-    response = await ai_assistant.generate_response(conversation, testing)
-    
-    # Find the message input field
-    input_selector = "div[data-qa-role='chat-input']"
-    input_field = await controller.page.query_selector(input_selector)
-    await highlighter.highlight_element(input_field,
-            color="rgba(0, 255, 0, 0.3)",
-            duration=3000)
+    async def prepare_input_field():
+        # Find, highlight and clear the editable message input
+        input_field = await controller.page.query_selector(_CHAT_INPUT_SELECTOR)
+        if not input_field:
+            return None
+
+        await highlighter.highlight_element(input_field,
+                color="rgba(0, 255, 0, 0.3)",
+                duration=3000)
+        # fill() focuses the field and clears it in one call
+        await input_field.fill("")
+        return input_field
+
+    # Look up the send button alongside everything else; it's only needed at the end
+    send_button_task = asyncio.ensure_future(
+        controller.page.query_selector("button[class='message-field__send']"))
+
+    # Start the AI response stream and get the input field ready while the first piece arrives
+    response_stream = ai_assistant.stream_response(conversation, testing)
+    first_piece_task = asyncio.ensure_future(_next_piece(response_stream))
+
+    async def abandon():
+        # Don't leave the send button lookup or the AI stream running
+        send_button_task.cancel()
+        first_piece_task.cancel()
+        await asyncio.gather(send_button_task, first_piece_task, return_exceptions=True)
+        await response_stream.aclose()
+
+    try:
+        input_field = await prepare_input_field()
+    except BaseException:
+        await abandon()
+        raise
 
     if not input_field:
         controller.logger.error("Could not find message input field")
+        await abandon()
         return False
 
-    # Clear any existing text
-    await input_field.click()
-    await input_field.press("Control+A")
-    await input_field.press("Backspace")
+    first_piece = await first_piece_task
 
-    # Type message with human-like typing
-    await type_human_like(input_field, response)
+    # Type the response as it streams in, so typing overlaps the rest of the AI call
+    await type_stream_human_like(input_field, response_stream, first_piece or "")
 
-    # Find and click the send button
-    send_button = await controller.page.query_selector("button[class='message-field__send']")
+    # Highlight the send button
+    send_button = await send_button_task
     await highlighter.highlight_element(send_button,
             color="rgba(0, 255, 0, 0.5)",
             duration=1000)
@@ -150,24 +227,70 @@ async def generate_and_send_response(
     # Actually send the message if testing mode is off
     if not testing:
         await send_button.click()
-        await asyncio.sleep(1)
+
+        # The chat clears the input once the message is sent. input_field is the
+        # editable element, so read .value for text fields and innerText otherwise
+        try:
+            await controller.page.wait_for_function(
+                _INPUT_IS_EMPTY_JS, arg=input_field, timeout=3000)
+        except TimeoutError:
+            logger.warning("Message input was not cleared within 3 seconds of sending")
+
+
+async def _next_piece(stream: AsyncIterator[str]) -> Optional[str]:
+    """Get the next piece of a response stream, or None once it is exhausted."""
+    try:
+        return await stream.__anext__()
+    except StopAsyncIteration:
+        return None
 
 
 async def type_human_like(element: ElementHandle, text: str):
     """
     Type text with human-like delays and variations.
-    Splits text into words and types them with random delays.
-    Adds spaces between words except after the last.
+    Inserts all but the last few words in one go, then types the remaining
+    words with a random per-key delay.
 
     Args:
         element: Element to type into
         text: Text to type
     """
-    words = text.split()
-    for i, word in enumerate(words):
-        await element.type(word, delay=random.randint(50, 100))
-        if i < len(words) - 1:
-            await element.type(" ")
+    text = " ".join(text.split())
+
+    # Split on a word boundary so only the tail words are typed key by key
+    boundary = text.rfind(" ", 0, max(len(text) - HUMAN_TYPED_TAIL_CHARS, 0) + 1)
+    if boundary > 0:
+        await element.evaluate(_INSERT_TEXT_JS, text[:boundary + 1])
+        text = text[boundary + 1:]
+
+    # One type() call for the whole tail; Playwright applies the delay between keys
+    if text:
+        await element.type(text, delay=random.randint(50, 100))
+
+
+async def type_stream_human_like(element: ElementHandle, pieces: AsyncIterator[str], text: str = ""):
+    """
+    Type streamed text the same way as type_human_like.
+    Whole words are inserted as soon as they arrive, holding back the last
+    few words, which are typed with type_human_like once the stream ends.
+
+    Args:
+        element: Element to type into
+        pieces: Stream of text pieces to type, in order
+        text: Text already received from the stream
+    """
+    async for piece in pieces:
+        text += piece
+
+        # Insert up to a word boundary that is safely before the held-back tail
+        boundary = text.rfind(" ", 0, max(len(text) - HUMAN_TYPED_TAIL_CHARS, 0) + 1)
+        if boundary > 0:
+            head = " ".join(text[:boundary].split())
+            if head:
+                await element.evaluate(_INSERT_TEXT_JS, head + " ")
+            text = text[boundary + 1:]
+
+    await type_human_like(element, text)
 
 
 async def chat_to_latest(
@@ -175,9 +298,8 @@ async def chat_to_latest(
     highlighter: ElementHighlighter,
     testing: bool = False
 ):    
-    # Navigate to Bumble (assuming logged in) and wait for page to load
-    await controller.navigate("https://bumble.com/app")
-    await controller.page.wait_for_load_state("domcontentloaded")
+    # Navigate to Bumble (assuming logged in) and wait for the contact list
+    await navigate_to_bumble(controller)
 
     # Purely visual purposes
     await highlighter.find_and_highlight_interactive_elements()
@@ -191,5 +313,7 @@ async def chat_to_latest(
     if conversation:
         await generate_and_send_response(controller, highlighter, conversation, testing)
     else:
-        print("All conversations have been responded to.")
+        logger.info("All conversations have been responded to.")
+
+    await controller.drain_highlights()
     
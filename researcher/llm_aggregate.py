@@ -1,7 +1,10 @@
 import os
 import json
-from typing import List, Dict, Any, Optional
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
 import openai
+from openai import AsyncOpenAI
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -13,21 +16,21 @@ OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY')
 # Initialize OpenAI client
 openai.api_key = OPENAI_API_KEY
 
-def aggregate_person_info(scraped_results: List[Dict[str, Any]], person_context: str) -> Optional[Dict[str, str]]:
+# Worker used to run the async batch from code that is already inside an event loop
+_ASYNC_RUNNER = ThreadPoolExecutor(max_workers=1)
+
+
+def _build_messages(scraped_results: List[Dict[str, Any]], person_context: str) -> Optional[Tuple[List[Dict[str, str]], List[Dict[str, Any]]]]:
     """
-    Analyze scraped content using ChatGPT API to extract structured information about a person.
+    Build the ChatGPT messages for a set of scraped results.
     
     Args:
         scraped_results: List of dictionaries with keys 'url', 'success', and 'content'
+        person_context: Context about the person scraped from the dating app
         
     Returns:
-        Dictionary with structured information about the person (name and description)
-        or None if no valid information could be extracted
+        Tuple of (messages, successful scrapes), or None if there is nothing to analyze
     """
-    if not OPENAI_API_KEY:
-        print("Error: OpenAI API key not found. Please set the OPENAI_API_KEY environment variable.")
-        return None
-        
     # Filter for successful scrapes only
     successful_scrapes = [result for result in scraped_results if result.get('success')]
     
@@ -71,58 +74,166 @@ def aggregate_person_info(scraped_results: List[Dict[str, Any]], person_context:
     \n\n{combined_content}
     """
     
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt}
+    ]
+    return messages, successful_scrapes
+
+
+def _parse_response(result_text: str, successful_scrapes: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Parse the ChatGPT JSON reply into the person info dictionary.
+    
+    Args:
+        result_text: Raw JSON content of the ChatGPT reply
+        successful_scrapes: Scraped results the reply was based on
+        
+    Returns:
+        Dictionary with name, description and metadata, or None if fields are missing
+    """
+    result_json = json.loads(result_text)
+    
+    # Ensure the expected keys are present
+    if 'name' not in result_json or 'description' not in result_json:
+        print("Error: API response missing required fields")
+        return None
+        
+    metadata = [{"url": result.get('url'), "thumbnailUrl": result.get('thumbnailUrl'), "likenessScore": result.get('likenessScore')} for result in successful_scrapes]
+    return {
+        'name': result_json['name'],
+        'description': result_json['description'],
+        'metadata': metadata
+    }
+
+
+def aggregate_person_info(scraped_results: List[Dict[str, Any]], person_context: str) -> Optional[Dict[str, str]]:
+    """
+    Analyze scraped content using ChatGPT API to extract structured information about a person.
+    
+    Args:
+        scraped_results: List of dictionaries with keys 'url', 'success', and 'content'
+        person_context: Context about the person scraped from the dating app
+        
+    Returns:
+        Dictionary with structured information about the person (name and description)
+        or None if no valid information could be extracted
+    """
+    if not OPENAI_API_KEY:
+        print("Error: OpenAI API key not found. Please set the OPENAI_API_KEY environment variable.")
+        return None
+    
+    prepared = _build_messages(scraped_results, person_context)
+    if not prepared:
+        return None
+    messages, successful_scrapes = prepared
+    
     try:
         # Call ChatGPT API
         response = openai.chat.completions.create(
             model="gpt-4o",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
+            messages=messages,
             response_format={"type": "json_object"},
             temperature=0.0
         )
         
         # Extract and parse the response
-        result_text = response.choices[0].message.content
-        result_json = json.loads(result_text)
+        return _parse_response(response.choices[0].message.content, successful_scrapes)
+        
+    except Exception as e:
+        print(f"Error calling ChatGPT API: {e}")
+        return None
+
+
+async def aggregate_person_info_async(scraped_results: List[Dict[str, Any]],
+                                      person_context: str,
+                                      client: Optional[AsyncOpenAI] = None) -> Optional[Dict[str, str]]:
+    """
+    Async version of aggregate_person_info().
+    
+    Args:
+        scraped_results: List of dictionaries with keys 'url', 'success', and 'content'
+        person_context: Context about the person scraped from the dating app
+        client: AsyncOpenAI client to use; a temporary one is created if None
+        
+    Returns:
+        Dictionary with structured information about the person (name and description)
+        or None if no valid information could be extracted
+    """
+    if not OPENAI_API_KEY:
+        print("Error: OpenAI API key not found. Please set the OPENAI_API_KEY environment variable.")
+        return None
+    
+    if client is None:
+        # The client's connection pool is tied to the running event loop, so
+        # a temporary one is closed before returning
+        async with AsyncOpenAI(api_key=OPENAI_API_KEY) as client:
+            return await aggregate_person_info_async(scraped_results, person_context, client)
+    
+    prepared = _build_messages(scraped_results, person_context)
+    if not prepared:
+        return None
+    messages, successful_scrapes = prepared
+    
+    try:
+        # Call ChatGPT API without blocking the event loop
+        response = await client.chat.completions.create(
+            model="gpt-4o",
+            messages=messages,
+            response_format={"type": "json_object"},
+            temperature=0.0
+        )
         
-        # Ensure the expected keys are present
-        if 'name' not in result_json or 'description' not in result_json:
-            print("Error: API response missing required fields")
-            return None
-            
-        metadata = [{"url": result.get('url'), "thumbnailUrl": result.get('thumbnailUrl'), "likenessScore": result.get('likenessScore')} for result in successful_scrapes]
-        return {
-            'name': result_json['name'],
-            'description': result_json['description'],
-            'metadata': metadata
-        }
+        # Extract and parse the response
+        return _parse_response(response.choices[0].message.content, successful_scrapes)
         
     except Exception as e:
         print(f"Error calling ChatGPT API: {e}")
         return None
 
 
-def analyze_multiple_people(batch_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+async def analyze_multiple_people_async(batch_results: List[Dict[str, Any]], person_context: str = "") -> List[Dict[str, Any]]:
+    """
+    Process multiple sets of scraped results concurrently, each potentially about a different person.
+    
+    Args:
+        batch_results: List of lists of scraped results, where each inner list represents
+                      content about a potentially different person
+        person_context: Context about the person scraped from the dating app
+                      
+    Returns:
+        List of dictionaries with structured information about each person
+    """
+    print(f"Analyzing {len(batch_results)} people...")
+    
+    # One client for the batch, closed on this event loop once it is done
+    async with AsyncOpenAI(api_key=OPENAI_API_KEY) as client:
+        person_infos = await asyncio.gather(*[
+            aggregate_person_info_async(person_results, person_context, client)
+            for person_results in batch_results
+        ])
+    
+    return [person_info for person_info in person_infos if person_info]
+
+
+def analyze_multiple_people(batch_results: List[Dict[str, Any]], person_context: str = "") -> List[Dict[str, Any]]:
     """
     Process multiple sets of scraped results, each potentially about a different person.
     
     Args:
         batch_results: List of lists of scraped results, where each inner list represents
                       content about a potentially different person
+        person_context: Context about the person scraped from the dating app
                       
     Returns:
         List of dictionaries with structured information about each person
     """
-    results = []
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(analyze_multiple_people_async(batch_results, person_context))
     
-    for i, person_results in enumerate(batch_results):
-        print(f"Analyzing person {i+1}/{len(batch_results)}...")
-        person_info = aggregate_person_info(person_results)
-        
-        if person_info:
-            # Add the original URLs to the result
-            results.append(person_info)
-        
-    return results
+    # asyncio.run() can't nest inside a running loop, so run the batch on its own
+    # loop in a worker thread; like any sync call, this blocks the caller until done
+    return _ASYNC_RUNNER.submit(
+        asyncio.run, analyze_multiple_people_async(batch_results, person_context)).result()
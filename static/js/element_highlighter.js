@@ -6,6 +6,10 @@
  */
 
 window.elementHighlighter = (function () {
+  // The script may be registered more than once on a context; keep the first
+  // instance so observers and listeners aren't attached again
+  if (window.elementHighlighter) return window.elementHighlighter;
+
   // Private variables
   const HIGHLIGHT_CONTAINER_ID = "playwright-highlight-container";
   let highlightIndex = 0;
@@ -28,6 +32,142 @@ window.elementHighlighter = (function () {
     "#4682B4",
   ];
 
+  // Run a scan and report the DOM version it saw, for the Python-side cache
+  function scanInteractiveElements(options) {
+    const count = findAndHighlightInteractiveElements(options);
+    return { count: count, domVersion: getDomVersion() };
+  }
+
+  // Check several selectors for interactivity in one call
+  function areInteractiveElements(selectors) {
+    return selectors.map((selector) => {
+      const element = cachedQuerySelector(selector);
+      if (!element) return false;
+      return isInteractiveElement(element);
+    });
+  }
+
+  // Draw several single-element highlights in one call
+  function drawElementHighlights(items) {
+    return items.map(drawElementHighlight);
+  }
+
+  // Container for single-element highlights drawn from Python
+  const SINGLE_HIGHLIGHT_CONTAINER_ID = "highlight-container";
+  let singleHighlightContainer = null;
+
+  // Hidden single-highlight nodes waiting to be reused
+  let singleHighlightPool = [];
+
+  // Create the single-highlight container on first use and reuse it afterwards
+  function getSingleHighlightContainer() {
+    if (!singleHighlightContainer || !singleHighlightContainer.isConnected) {
+      singleHighlightContainer = document.createElement("div");
+      singleHighlightContainer.id = SINGLE_HIGHLIGHT_CONTAINER_ID;
+      singleHighlightContainer.style.position = "fixed";
+      singleHighlightContainer.style.pointerEvents = "none";
+      singleHighlightContainer.style.top = "0";
+      singleHighlightContainer.style.left = "0";
+      singleHighlightContainer.style.width = "100%";
+      singleHighlightContainer.style.height = "100%";
+      singleHighlightContainer.style.zIndex = "2147483647";
+      document.body.appendChild(singleHighlightContainer);
+      singleHighlightPool = [];
+    }
+    return singleHighlightContainer;
+  }
+
+  // Draw a temporary overlay over one element, given by selector or element
+  function drawElementHighlight(item) {
+    const element =
+      item.selector !== null ? cachedQuerySelector(item.selector) : item.element;
+    if (!element) return false; // Element not found
+
+    if (item.mode === "outline") {
+      return outlineElement(element, item);
+    }
+
+    const box = element.getBoundingClientRect();
+    if (box.width === 0 && box.height === 0) return false; // Element not visible
+
+    const duration = item.duration;
+
+    // Highlight container, created once per document
+    const container = getSingleHighlightContainer();
+
+    // Reuse a pooled highlight node; only its geometry and colors change
+    const highlight = acquireSingleHighlightNode(container);
+    highlight.style.left = `${box.x}px`;
+    highlight.style.top = `${box.y}px`;
+    highlight.style.width = `${box.width}px`;
+    highlight.style.height = `${box.height}px`;
+    highlight.style.backgroundColor = item.fill;
+    highlight.style.border = `2px solid ${item.border}`;
+
+    // Hide the highlight again after the specified duration
+    if (duration > 0) {
+      const token = highlight.highlightToken;
+      setTimeout(() => {
+        // Skip if the node was released and reused in the meantime
+        if (highlight.highlightToken === token) {
+          releaseSingleHighlightNode(highlight);
+        }
+      }, duration);
+    }
+
+    return true;
+  }
+
+  // Outline values to restore, for elements currently outlined by us
+  const originalOutlines = new WeakMap();
+
+  // Cheap highlight: outline the element itself, no overlay or layout reads
+  function outlineElement(element, item) {
+    if (!originalOutlines.has(element)) {
+      originalOutlines.set(element, element.style.outline);
+    }
+    element.style.outline = `3px solid ${item.border}`;
+
+    if (item.duration > 0) {
+      const outline = element.style.outline;
+      setTimeout(() => {
+        // Leave it if a newer highlight replaced the outline meanwhile
+        if (element.style.outline === outline && originalOutlines.has(element)) {
+          element.style.outline = originalOutlines.get(element);
+          originalOutlines.delete(element);
+        }
+      }, item.duration);
+    }
+
+    return true;
+  }
+
+  // Take a node from the pool, creating one if the pool is empty
+  function acquireSingleHighlightNode(container) {
+    let node = singleHighlightPool.pop();
+    if (!node || node.parentNode !== container) {
+      node = document.createElement("div");
+      node.className = "element-highlight";
+      node.style.position = "fixed";
+      node.style.boxSizing = "border-box";
+      node.style.pointerEvents = "none";
+      node.style.zIndex = "10000";
+      node.highlightToken = 0;
+      container.appendChild(node);
+    }
+    node.highlightToken++;
+    node.style.display = "block";
+    return node;
+  }
+
+  // Hide a node and return it to the pool; it stays in the container
+  function releaseSingleHighlightNode(node) {
+    if (node.style.display === "none") return;
+    node.style.display = "none";
+    node.highlightToken++;
+    singleHighlightPool.push(node);
+  }
+
   // DOM caching for performance
   const DOM_CACHE = {
     boundingRects: new WeakMap(),
@@ -38,6 +178,75 @@ window.elementHighlighter = (function () {
     },
   };
 
+  // DOM version tracking so unchanged pages can skip a rescan.
+  // The token distinguishes documents, the counter changes on every
+  // mutation, scroll or resize outside of our own highlight overlay
+  const DOCUMENT_TOKEN = Math.random().toString(36).slice(2);
+  let domMutationCount = 0;
+
+  function isHighlightNode(node) {
+    if (!node || node.nodeType !== Node.ELEMENT_NODE) return false;
+    return (
+      node.id === HIGHLIGHT_CONTAINER_ID ||
+      node.id === SINGLE_HIGHLIGHT_CONTAINER_ID ||
+      node.closest(`#${HIGHLIGHT_CONTAINER_ID}, #${SINGLE_HIGHLIGHT_CONTAINER_ID}`) !== null
+    );
+  }
+
+  function isOwnMutation(record) {
+    if (isHighlightNode(record.target)) return true;
+    if (record.type !== "childList") return false;
+    const nodes = [...record.addedNodes, ...record.removedNodes];
+    return nodes.length > 0 && nodes.every(isHighlightNode);
+  }
+
+  new MutationObserver((records) => {
+    if (!records.every(isOwnMutation)) {
+      domMutationCount++;
+    }
+  }).observe(document, {
+    subtree: true,
+    childList: true,
+    attributes: true,
+    characterData: true,
+  });
+
+  // Scrolling and resizing change which elements are in the viewport
+  const bumpDomVersion = () => {
+    domMutationCount++;
+  };
+  window.addEventListener("scroll", bumpDomVersion, { capture: true, passive: true });
+  window.addEventListener("resize", bumpDomVersion, { passive: true });
+
+  function getDomVersion() {
+    return `${DOCUMENT_TOKEN}:${domMutationCount}`;
+  }
+
+  // querySelector results, valid until the DOM version changes
+  const QSA_CACHE = new Map();
+  let qsaCacheEpoch = domMutationCount;
+
+  function cachedQuerySelector(selector) {
+    if (qsaCacheEpoch !== domMutationCount) {
+      QSA_CACHE.clear();
+      qsaCacheEpoch = domMutationCount;
+    }
+
+    // Re-check the match too, since pseudo-classes like :checked change without mutations
+    const cached = QSA_CACHE.get(selector);
+    if (cached && cached.isConnected && cached.matches(selector)) {
+      return cached;
+    }
+
+    const element = document.querySelector(selector);
+    if (element) {
+      QSA_CACHE.set(selector, element);
+    } else {
+      QSA_CACHE.delete(selector);
+    }
+    return element;
+  }
+
   // Helper functions for DOM operations with caching
   function getCachedBoundingRect(element) {
     if (!element) return null;
@@ -104,32 +313,106 @@ window.elementHighlighter = (function () {
     return segments.join("/");
   }
 
-  // Core highlighting function
+  // Elements found by the current scan, drawn together by flushHighlights()
+  let pendingHighlights = [];
+
+  // Overlay and label nodes of the current scan, keyed by highlight index
+  const drawnHighlights = new Map();
+
+  // Get the scan highlight container, creating it on first use
+  function getHighlightContainer() {
+    let container = document.getElementById(HIGHLIGHT_CONTAINER_ID);
+    if (!container) {
+      container = document.createElement("div");
+      container.id = HIGHLIGHT_CONTAINER_ID;
+      container.style.position = "fixed";
+      container.style.pointerEvents = "none";
+      container.style.top = "0";
+      container.style.left = "0";
+      container.style.width = "100%";
+      container.style.height = "100%";
+      container.style.zIndex = "2147483647";
+      document.body.appendChild(container);
+    }
+    return container;
+  }
+
+  // Scroll/resize listener keeping the current overlays aligned
+  let repositionHighlights = null;
+
+  // Queue an element for highlighting; nothing touches the DOM until the flush
   function highlightElement(element, index, parentIframe = null) {
     if (!element) return index;
+    pendingHighlights.push({ element, index, parentIframe });
+    return index + 1;
+  }
 
-    try {
-      // Create or get highlight container
-      let container = document.getElementById(HIGHLIGHT_CONTAINER_ID);
-      if (!container) {
-        container = document.createElement("div");
-        container.id = HIGHLIGHT_CONTAINER_ID;
-        container.style.position = "fixed";
-        container.style.pointerEvents = "none";
-        container.style.top = "0";
-        container.style.left = "0";
-        container.style.width = "100%";
-        container.style.height = "100%";
-        container.style.zIndex = "2147483647";
-        document.body.appendChild(container);
+  const LABEL_WIDTH = 20;
+  const LABEL_HEIGHT = 16;
+
+  // Read phase: measure an element (and its iframe) without writing to the DOM
+  function measureHighlight(item) {
+    const rect = item.element.getBoundingClientRect();
+    let iframeOffset = { x: 0, y: 0 };
+
+    // If element is in an iframe, calculate iframe offset
+    if (item.parentIframe) {
+      const iframeRect = item.parentIframe.getBoundingClientRect();
+      iframeOffset.x = iframeRect.left;
+      iframeOffset.y = iframeRect.top;
+    }
+
+    // Calculate position
+    const top = rect.top + iframeOffset.y;
+    const left = rect.left + iframeOffset.x;
+
+    let labelTop = top + 2;
+    let labelLeft = left + rect.width - LABEL_WIDTH - 2;
+
+    if (rect.width < LABEL_WIDTH + 4 || rect.height < LABEL_HEIGHT + 4) {
+      labelTop = top - LABEL_HEIGHT - 2;
+      labelLeft = left + rect.width - LABEL_WIDTH;
+    }
+
+    return { top, left, width: rect.width, height: rect.height, labelTop, labelLeft };
+  }
+
+  // Write phase: position an overlay and its label from a measurement
+  function positionHighlight(overlay, label, box) {
+    overlay.style.top = `${box.top}px`;
+    overlay.style.left = `${box.left}px`;
+    overlay.style.width = `${box.width}px`;
+    overlay.style.height = `${box.height}px`;
+    label.style.top = `${box.labelTop}px`;
+    label.style.left = `${box.labelLeft}px`;
+  }
+
+  // Draw every queued highlight: all layout reads first, then one DOM insertion
+  function flushHighlights() {
+    const items = pendingHighlights;
+    pendingHighlights = [];
+    if (items.length === 0) return;
+
+    // Read phase
+    const boxes = [];
+    for (const item of items) {
+      try {
+        boxes.push(measureHighlight(item));
+      } catch (e) {
+        console.error("Error highlighting element:", e);
+        boxes.push(null);
       }
+    }
 
-      // Get element position
-      const rect = element.getBoundingClientRect();
-      if (!rect) return index;
+    // Write phase, built off-DOM in a fragment
+    const fragment = document.createDocumentFragment();
+    const drawn = [];
+    items.forEach((item, i) => {
+      const box = boxes[i];
+      if (!box) return;
 
       // Generate a color based on the index
-      const colorIndex = index % COLORS.length;
+      const colorIndex = item.index % COLORS.length;
       const baseColor = COLORS[colorIndex];
       const backgroundColor = baseColor + "1A"; // 10% opacity version of the color
 
@@ -141,26 +424,7 @@ window.elementHighlighter = (function () {
       overlay.style.pointerEvents = "none";
       overlay.style.boxSizing = "border-box";
 
-      // Get element position
-      let iframeOffset = { x: 0, y: 0 };
-
-      // If element is in an iframe, calculate iframe offset
-      if (parentIframe) {
-        const iframeRect = parentIframe.getBoundingClientRect();
-        iframeOffset.x = iframeRect.left;
-        iframeOffset.y = iframeRect.top;
-      }
-
-      // Calculate position
-      const top = rect.top + iframeOffset.y;
-      const left = rect.left + iframeOffset.x;
-
-      overlay.style.top = `${top}px`;
-      overlay.style.left = `${left}px`;
-      overlay.style.width = `${rect.width}px`;
-      overlay.style.height = `${rect.height}px`;
-
-      // Create and position label
+      // Create label
       const label = document.createElement("div");
       label.className = "playwright-highlight-label";
       label.style.position = "fixed";
@@ -168,69 +432,61 @@ window.elementHighlighter = (function () {
       label.style.color = "white";
       label.style.padding = "1px 4px";
       label.style.borderRadius = "4px";
-      label.style.fontSize = `${Math.min(12, Math.max(8, rect.height / 2))}px`;
-      label.textContent = index;
-
-      const labelWidth = 20;
-      const labelHeight = 16;
-
-      let labelTop = top + 2;
-      let labelLeft = left + rect.width - labelWidth - 2;
-
-      if (rect.width < labelWidth + 4 || rect.height < labelHeight + 4) {
-        labelTop = top - labelHeight - 2;
-        labelLeft = left + rect.width - labelWidth;
-      }
-
-      label.style.top = `${labelTop}px`;
-      label.style.left = `${labelLeft}px`;
-
-      // Add to container
-      container.appendChild(overlay);
-      container.appendChild(label);
-
-      // Update positions on scroll
-      const updatePositions = () => {
-        const newRect = element.getBoundingClientRect();
-        let newIframeOffset = { x: 0, y: 0 };
-
-        if (parentIframe) {
-          const iframeRect = parentIframe.getBoundingClientRect();
-          newIframeOffset.x = iframeRect.left;
-          newIframeOffset.y = iframeRect.top;
-        }
-
-        const newTop = newRect.top + newIframeOffset.y;
-        const newLeft = newRect.left + newIframeOffset.x;
-
-        overlay.style.top = `${newTop}px`;
-        overlay.style.left = `${newLeft}px`;
-        overlay.style.width = `${newRect.width}px`;
-        overlay.style.height = `${newRect.height}px`;
-
-        let newLabelTop = newTop + 2;
-        let newLabelLeft = newLeft + newRect.width - labelWidth - 2;
+      label.style.fontSize = `${Math.min(12, Math.max(8, box.height / 2))}px`;
+      label.textContent = item.index;
+
+      positionHighlight(overlay, label, box);
+      fragment.appendChild(overlay);
+      fragment.appendChild(label);
+      drawn.push({ item, overlay, label });
+      drawnHighlights.set(item.index, [overlay, label]);
+    });
+
+    // One insertion for the whole scan
+    getHighlightContainer().appendChild(fragment);
+
+    // Update positions on scroll, again reading everything before writing
+    detachRepositionListener();
+    repositionHighlights = () => {
+      const newBoxes = drawn.map(({ item }) => measureHighlight(item));
+      drawn.forEach(({ overlay, label }, i) => {
+        if (overlay.isConnected) positionHighlight(overlay, label, newBoxes[i]);
+      });
+    };
+    window.addEventListener("scroll", repositionHighlights);
+    window.addEventListener("resize", repositionHighlights);
+  }
 
-        if (
-          newRect.width < labelWidth + 4 ||
-          newRect.height < labelHeight + 4
-        ) {
-          newLabelTop = newTop - labelHeight - 2;
-          newLabelLeft = newLeft + newRect.width - labelWidth;
-        }
+  function detachRepositionListener() {
+    if (repositionHighlights) {
+      window.removeEventListener("scroll", repositionHighlights);
+      window.removeEventListener("resize", repositionHighlights);
+      repositionHighlights = null;
+    }
+  }
 
-        label.style.top = `${newLabelTop}px`;
-        label.style.left = `${newLabelLeft}px`;
-      };
+  // Viewport margin of the current scan in px (-1 = no viewport limit)
+  let viewportExpansion = 0;
 
-      window.addEventListener("scroll", updatePositions);
-      window.addEventListener("resize", updatePositions);
+  // Check if an element lies within the viewport grown by viewportExpansion
+  function isInExpandedViewport(element, parentIframe) {
+    if (viewportExpansion === -1) return true;
 
-      return index + 1;
-    } catch (e) {
-      console.error("Error highlighting element:", e);
-      return index;
+    const rect = getCachedBoundingRect(element);
+    let offsetX = 0;
+    let offsetY = 0;
+    if (parentIframe) {
+      const iframeRect = getCachedBoundingRect(parentIframe);
+      offsetX = iframeRect.left;
+      offsetY = iframeRect.top;
     }
+
+    return (
+      rect.bottom + offsetY >= -viewportExpansion &&
+      rect.top + offsetY <= window.innerHeight + viewportExpansion &&
+      rect.right + offsetX >= -viewportExpansion &&
+      rect.left + offsetX <= window.innerWidth + viewportExpansion
+    );
   }
 
   // Element visibility check
@@ -411,9 +667,15 @@ window.elementHighlighter = (function () {
 
     const config = { ...defaults, ...options };
 
+    // Nothing changed since the caller's last scan; let it reuse that result
+    if (config.lastDomVersion && config.lastDomVersion === getDomVersion()) {
+      return -1;
+    }
+
     // Reset for new highlighting session
     highlightIndex = 0;
     ID.current = 0;
+    viewportExpansion = config.viewportExpansion;
     DOM_CACHE.clearCache();
 
     // Remove any existing highlights
@@ -422,7 +684,7 @@ window.elementHighlighter = (function () {
     // If parentSelector is provided, use that as the starting point
     let startNode = document.body;
     if (config.parentSelector) {
-      const parentElement = document.querySelector(config.parentSelector);
+      const parentElement = cachedQuerySelector(config.parentSelector);
       if (parentElement) {
         console.log(
           `Starting highlight from parent selector: ${config.parentSelector}`
@@ -435,8 +697,10 @@ window.elementHighlighter = (function () {
       }
     }
 
-    // Start processing from the selected node
+    // Start processing from the selected node, then draw everything it found
+    pendingHighlights = [];
     buildDomTree(startNode);
+    flushHighlights();
 
     return highlightIndex;
   }
@@ -458,13 +722,18 @@ window.elementHighlighter = (function () {
 
     // Highlight the specific element
     highlightElement(element, highlightIndex);
+    flushHighlights();
 
     return 1; // Return 1 as we highlighted exactly one element
   }
 
   // Process DOM tree to find interactive elements
   function buildDomTree(node, parentIframe = null) {
-    if (!node || node.id === HIGHLIGHT_CONTAINER_ID) {
+    if (
+      !node ||
+      node.id === HIGHLIGHT_CONTAINER_ID ||
+      node.id === SINGLE_HIGHLIGHT_CONTAINER_ID
+    ) {
       return null;
     }
 
@@ -487,7 +756,10 @@ window.elementHighlighter = (function () {
 
     // Check visibility and interactivity
     if (node.nodeType === Node.ELEMENT_NODE) {
-      nodeData.isVisible = isElementVisible(node);
+      // Elements outside the scan area skip the style and hit-test checks;
+      // their children are still walked since they can overflow the parent
+      nodeData.isInViewport = isInExpandedViewport(node, parentIframe);
+      nodeData.isVisible = nodeData.isInViewport && isElementVisible(node);
       if (nodeData.isVisible) {
         nodeData.isTopElement = isTopElement(node);
         if (nodeData.isTopElement) {
@@ -540,12 +812,51 @@ window.elementHighlighter = (function () {
   }
 
   // Remove all highlights
+  // Clear the highlight containers in place with one write each; the
+  // containers stay attached so the next scan can reuse them
   function removeAllHighlights() {
+    detachRepositionListener();
+    drawnHighlights.clear();
+
+    let removed = false;
     const container = document.getElementById(HIGHLIGHT_CONTAINER_ID);
-    if (container) {
-      container.remove();
+    if (container && container.firstChild) {
+      container.replaceChildren();
+      removed = true;
+    }
+
+    // Single highlights go back to the pool rather than being removed
+    if (singleHighlightContainer && singleHighlightContainer.isConnected) {
+      for (const node of singleHighlightContainer.children) {
+        if (node.style.display !== "none") {
+          releaseSingleHighlightNode(node);
+          removed = true;
+        }
+      }
+    }
+
+    if (removed) {
+      // Highlights are gone, so a cached scan result no longer matches the page
+      domMutationCount++;
     }
   }
+
+  // Remove the overlays and labels of specific scan highlights
+  function removeHighlights(indices) {
+    let removed = 0;
+    for (const index of indices) {
+      const nodes = drawnHighlights.get(index);
+      if (!nodes) continue;
+      nodes.forEach((node) => node.remove());
+      drawnHighlights.delete(index);
+      removed++;
+    }
+
+    if (removed > 0) {
+      domMutationCount++;
+    }
+    return removed;
+  }
   
   // Function to highlight all text nodes within a parent element
   function highlightAllText(parentSelector) {
@@ -558,7 +869,7 @@ window.elementHighlighter = (function () {
     DOM_CACHE.clearCache();
     
     // Find the parent element
-    const parentElement = document.querySelector(parentSelector);
+    const parentElement = cachedQuerySelector(parentSelector);
     if (!parentElement) {
       console.warn(`Parent selector not found: ${parentSelector}`);
       return 0;
@@ -567,19 +878,7 @@ window.elementHighlighter = (function () {
     console.log(`Highlighting all text within: ${parentSelector}`);
     
     // Create a container for highlights if it doesn't exist
-    let container = document.getElementById(HIGHLIGHT_CONTAINER_ID);
-    if (!container) {
-      container = document.createElement("div");
-      container.id = HIGHLIGHT_CONTAINER_ID;
-      container.style.position = "fixed";
-      container.style.pointerEvents = "none";
-      container.style.top = "0";
-      container.style.left = "0";
-      container.style.width = "100%";
-      container.style.height = "100%";
-      container.style.zIndex = "2147483647";
-      document.body.appendChild(container);
-    }
+    const container = getHighlightContainer();
     
     // Function to process text nodes
     function processTextNodes(node) {
@@ -646,8 +945,15 @@ window.elementHighlighter = (function () {
   return {
     findAndHighlightInteractiveElements: findAndHighlightInteractiveElements,
     removeAllHighlights: removeAllHighlights,
+    removeHighlights: removeHighlights,
     isInteractiveElement: isInteractiveElement,
     highlightAllText: highlightAllText,
     highlightSpecificElement: highlightSpecificElement,
+    getDomVersion: getDomVersion,
+    querySelector: cachedQuerySelector,
+    drawElementHighlight: drawElementHighlight,
+    drawElementHighlights: drawElementHighlights,
+    scanInteractiveElements: scanInteractiveElements,
+    areInteractiveElements: areInteractiveElements,
   };
 })();
@@ -0,0 +1,57 @@
+"""
+Browser Session for Tinder Automation
+
+This module starts the browser, highlighter and page controller once so
+every entry point and flow can share them.
+"""
+
+import contextlib
+from dataclasses import asdict
+from typing import Tuple
+
+from playwright.async_api import Page
+
+from utils.config import get_browser_cfg
+from browser import PageController, ElementHighlighter, BrowserManager
+
+
+async def browser_init() -> Tuple[BrowserManager, Page, ElementHighlighter, PageController]:
+    """
+    Set up browser automation from the cached browser settings.
+
+    Returns:
+        Tuple of (browser manager, page, highlighter, page controller)
+    """
+    browser_manager = BrowserManager(**asdict(get_browser_cfg()))
+
+    # Initialize the highlighter and page controller
+    page = await browser_manager.start()
+    highlighter = ElementHighlighter(page)
+    controller = PageController(page, highlighter, randomize_behavior=browser_manager.randomize_behavior)
+    await controller.setup()
+
+    return browser_manager, page, highlighter, controller
+
+
+@contextlib.asynccontextmanager
+async def browser_session():
+    """
+    Run a block with one shared browser session and close it afterwards.
+
+    The session's storage state is saved on exit, so the next run starts
+    logged in without repeating the login navigation.
+
+    Example:
+        async with browser_session() as (browser_manager, page, highlighter, controller):
+            await chat_to_latest(controller, highlighter)
+    """
+    browser_manager, page, highlighter, controller = await browser_init()
+    try:
+        yield browser_manager, page, highlighter, controller
+
+        # Persist the session so the next run starts logged in
+        if browser_manager.storage_state_path:
+            await browser_manager.save_storage_state(browser_manager.storage_state_path)
+    finally:
+        # The last manager to close also shuts down the shared browser pool
+        await browser_manager.close()
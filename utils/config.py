@@ -6,6 +6,8 @@ This module handles loading and managing configuration settings.
 
 import os
 import json
+import functools
+from dataclasses import dataclass, field
 from typing import Dict, Any, Optional
 import logging
 
@@ -38,7 +40,7 @@ class Config:
         default_config = {
             "browser": {
                 "headless": False,
-                "slow_mo": 50,
+                "slow_mo": 0,
                 "viewport_size": {
                     "width": 1280,
                     "height": 800
@@ -184,3 +186,65 @@ class Config:
             True if saved successfully, False otherwise
         """
         return self._save_config()
+
+
+@functools.lru_cache(maxsize=1)
+def get_config() -> Config:
+    """
+    Get the shared configuration, loading it from file on first use.
+    
+    Returns:
+        The process-wide Config instance
+    """
+    return Config()
+
+
+@dataclass(frozen=True, slots=True)
+class BrowserCfg:
+    """Snapshot of the browser settings, named after BrowserManager's arguments."""
+    
+    headless: bool = False
+    slow_mo: int = 0
+    viewport_size: Dict[str, int] = field(default_factory=lambda: {"width": 1280, "height": 800})
+    user_agent: Optional[str] = None
+    enable_stealth_mode: bool = True
+    randomize_behavior: bool = True
+    bypass_webdriver_flags: bool = True
+    proxy: Optional[Dict[str, str]] = None
+    use_debug_mode: bool = True
+    storage_state_path: Optional[str] = None
+    
+    @classmethod
+    def from_config(cls, config: Config) -> "BrowserCfg":
+        """
+        Build the browser settings from a configuration.
+        
+        Args:
+            config: Configuration to read the browser section from
+            
+        Returns:
+            Browser settings snapshot
+        """
+        return cls(
+            headless=config.get("browser.headless", False),
+            slow_mo=config.get("browser.slow_mo", 0),
+            viewport_size=config.get("browser.viewport_size", {"width": 1280, "height": 800}),
+            user_agent=config.get("browser.user_agent"),
+            enable_stealth_mode=config.get("browser.stealth_mode", True),
+            randomize_behavior=config.get("browser.randomize_behavior", True),
+            bypass_webdriver_flags=config.get("browser.bypass_webdriver_flags", True),
+            proxy=config.get("browser.proxy"),
+            use_debug_mode=config.get("browser.use_debug_mode", True),
+            storage_state_path=config.get("browser.storage_state_path"),
+        )
+
+
+@functools.lru_cache(maxsize=1)
+def get_browser_cfg() -> BrowserCfg:
+    """
+    Get the browser settings from the shared configuration, read once.
+    
+    Returns:
+        Browser settings snapshot
+    """
+    return BrowserCfg.from_config(get_config())